@@ -0,0 +1,190 @@
+#allocation audit (F7): tracemalloc and gc callbacks report Python allocations and GC pauses per frame and phase
+#it hooks into the telemetry phase marks, so phases are the same as in the trace
+#tracemalloc counts every thread, so it won't start while another one (the capture writer) is running,
+#and frames that still ran alongside one are counted in the report
+import gc
+import os
+import sys
+import time
+import threading
+import tracemalloc
+from array import array
+from telemetry import PHASES
+
+FRAME_BUDGET_BYTES = 2048  # Steady-state frames should allocate no more than this at their peak
+WARMUP_FRAMES = 30  # Frames ignored after starting, while caches fill
+TOP_SITES = 15  # Source lines listed in the report
+
+
+class AllocationAudit():
+	def __init__(self, telemetry, output_dir='.'):
+		self.telemetry = telemetry
+		self.output_dir = output_dir
+		self.active = False
+
+	def start(self):
+		if self.active:
+			return
+		if threading.active_count() > 1:
+			print("Allocation audit not started: stop the capture (F8) first, "
+				  "its writer thread's allocations would be counted in the frames")
+			return
+		self.active = True
+		tracemalloc.start()
+		gc.callbacks.append(self.on_gc)
+		# Per phase: net allocated blocks and bytes, and peak bytes in use above the phase start
+		# (transient allocations included), summed over frames; plus the worst peak
+		self.phase_blocks = array('d', bytes(8 * len(PHASES)))
+		self.phase_bytes = array('d', bytes(8 * len(PHASES)))
+		self.phase_peaks = array('d', bytes(8 * len(PHASES)))
+		self.phase_max_peak = array('d', bytes(8 * len(PHASES)))
+		# Per frame: peak bytes above the frame start, net blocks, GC pause
+		self.frame_peaks = array('d')
+		self.frame_blocks = array('d')
+		self.frame_gc_ms = array('d')
+		self.shared_frames = 0  # Frames that ended with another thread running
+		self.gc_runs = [0, 0, 0]
+		self.gc_ms = 0.0
+		self.gc_max_ms = 0.0
+		self.gc_start = 0.0
+		self.frame_gc = 0.0
+		self.frames = 0
+		self.in_frame = False
+		self.baseline = None
+		self.calibrate()
+		# Phase marks come from telemetry, so record while auditing
+		self.telemetry.set_enabled('audit', True)
+		self.telemetry.audit = self
+		print("Allocation audit started")
+
+	def calibrate(self):
+		# Back-to-back marks still differ by the audit's own integers; measure that so it can be subtracted
+		self.bias_bytes = 0
+		self.bias_blocks = 0
+		self.frames = WARMUP_FRAMES
+		self.in_frame = True
+		self.frame_start = self.last_bytes = tracemalloc.get_traced_memory()[0]
+		self.last_blocks = sys.getallocatedblocks()
+		self.frame_peak = 0
+		for i in range(100):
+			self.mark(0)
+		self.bias_bytes = self.phase_bytes[0] / 100
+		self.bias_blocks = self.phase_blocks[0] / 100
+		self.phase_bytes[0] = self.phase_blocks[0] = self.phase_peaks[0] = self.phase_max_peak[0] = 0
+		self.frames = 0
+		self.in_frame = False
+
+	def on_gc(self, phase, info):
+		if phase == 'start':
+			self.gc_start = time.perf_counter()
+		else:
+			pause = (time.perf_counter() - self.gc_start) * 1000
+			self.gc_runs[info['generation']] += 1
+			self.gc_ms += pause
+			self.gc_max_ms = max(self.gc_max_ms, pause)
+			self.frame_gc += pause
+
+	def begin_frame(self):
+		# Close the previous frame, then take the new frame's starting point
+		if self.in_frame:
+			current, peak = tracemalloc.get_traced_memory()
+			self.frames += 1
+			if self.frames > WARMUP_FRAMES:
+				self.frame_peaks.append(max(self.frame_peak, peak - self.frame_start))
+				self.frame_blocks.append(sys.getallocatedblocks() - self.frame_start_blocks)
+				self.frame_gc_ms.append(self.frame_gc)
+				if threading.active_count() > 1:
+					self.shared_frames += 1
+			elif self.frames == WARMUP_FRAMES:
+				self.baseline = tracemalloc.take_snapshot()
+		self.in_frame = True
+		self.frame_gc = 0.0
+		self.frame_peak = 0
+		tracemalloc.reset_peak()
+		self.frame_start = self.last_bytes = tracemalloc.get_traced_memory()[0]
+		self.frame_start_blocks = self.last_blocks = sys.getallocatedblocks()
+
+	def mark(self, phase):
+		if not self.in_frame:
+			return
+		current, peak = tracemalloc.get_traced_memory()
+		blocks = sys.getallocatedblocks()
+		if self.frames >= WARMUP_FRAMES:
+			self.phase_bytes[phase] += current - self.last_bytes - self.bias_bytes
+			self.phase_blocks[phase] += blocks - self.last_blocks - self.bias_blocks
+			phase_peak = peak - self.last_bytes
+			self.phase_peaks[phase] += phase_peak
+			if phase_peak > self.phase_max_peak[phase]:
+				self.phase_max_peak[phase] = phase_peak
+			if peak - self.frame_start > self.frame_peak:
+				self.frame_peak = peak - self.frame_start
+		# Measure after the calls above so their own allocations are not charged to the next phase
+		tracemalloc.reset_peak()
+		self.last_bytes = tracemalloc.get_traced_memory()[0]
+		self.last_blocks = sys.getallocatedblocks()
+
+	def status(self):
+		# One line for the performance overlay
+		if not self.active:
+			return 'off'
+		if not self.frame_peaks:
+			return 'warming up'
+		recent = self.frame_peaks[-60:]
+		return f'{max(recent) / 1024:.1f} KB peak'
+
+	def report(self):
+		lines = []
+		frames = len(self.frame_peaks)
+		lines.append(f"Allocation audit: {frames} frames after {WARMUP_FRAMES} warmup frames")
+		if frames:
+			peaks = sorted(self.frame_peaks)
+			over = sum(1 for peak in peaks if peak > FRAME_BUDGET_BYTES)
+			lines.append(f"Peak Python allocation per frame: median {peaks[frames // 2] / 1024:.2f} KB, "
+						 f"95th percentile {peaks[frames * 95 // 100] / 1024:.2f} KB, max {peaks[-1] / 1024:.2f} KB")
+			lines.append(f"Frames over the {FRAME_BUDGET_BYTES} byte budget: {over}")
+			if self.shared_frames:
+				lines.append(f"{self.shared_frames} of {frames} frames ran alongside another thread (capture writer); "
+							 f"their figures include that thread's allocations")
+			lines.append(f"Net blocks per frame: mean {sum(self.frame_blocks) / frames:+.2f}")
+			lines.append("")
+			lines.append(f"{'phase':<20}{'net blocks':>12}{'net bytes':>12}{'peak bytes':>12}{'worst peak':>12}   (per frame)")
+			for phase, name in enumerate(PHASES):
+				lines.append(f"{name:<20}{self.phase_blocks[phase] / frames:>12.2f}{self.phase_bytes[phase] / frames:>12.1f}"
+							 f"{self.phase_peaks[phase] / frames:>12.1f}{self.phase_max_peak[phase]:>12.0f}")
+		lines.append("")
+		lines.append(f"GC: {self.gc_runs[0]}/{self.gc_runs[1]}/{self.gc_runs[2]} collections (gen 0/1/2), "
+					 f"{self.gc_ms:.2f} ms total, longest pause {self.gc_max_ms:.2f} ms")
+		if self.baseline is not None:
+			# Lines still holding more memory than after warmup: leaks and unbounded caches
+			lines.append("")
+			lines.append("Growth since warmup by source line:")
+			snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__),
+																  tracemalloc.Filter(False, __file__)])
+			for stat in snapshot.compare_to(self.baseline, 'lineno')[:TOP_SITES]:
+				if stat.size_diff:
+					lines.append(f"  {stat.size_diff / 1024:+8.1f} KB {stat.count_diff:+6d} blocks  {stat.traceback}")
+		return lines
+
+	def stop(self):
+		if not self.active:
+			return
+		lines = self.report()
+		self.active = False
+		self.telemetry.audit = None
+		gc.callbacks.remove(self.on_gc)
+		tracemalloc.stop()
+		self.telemetry.set_enabled('audit', False)
+		path = os.path.join(self.output_dir, 'hopit-alloc-' + time.strftime('%Y%m%d-%H%M%S') + '.txt')
+		try:
+			with open(path, 'w') as file:
+				file.write('\n'.join(lines) + '\n')
+			print(f"Allocation audit written to {path}")
+		except Exception as e:
+			print(f"Could not write allocation audit: {e}")
+		print('\n'.join(lines[:4]))
+
+	def toggle(self):
+		if self.active:
+			self.stop()
+		else:
+			self.start()
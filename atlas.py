@@ -0,0 +1,137 @@
+#texture atlas: the sprites and button images are packed into one or two page surfaces with a name-to-rect table
+#each image is handed out as a subsurface of its page, so it draws like any other surface; the texture renderer
+#uploads each page once and draws the images as regions of it
+#build the atlas ahead of time with "python atlas.py" (writes assets/sprites.json and assets/sprites-N.png);
+#without it, or when a source image is newer, the images are loaded one by one and packed at startup
+import os
+import sys
+import json
+import pygame
+
+PAGE_SIZE = 1024  # Page width and height limit; an image wider than this gets a wider page
+PADDING = 1  # Transparent border around each image so scaled draws don't pick up a neighbour's pixels
+
+#images that go into the atlas, by name
+SPRITE_FILES = {
+	'jump1': 'assets/jump1.png',
+	'jump2': 'assets/jump2.png',
+	'jump3': 'assets/jump3.png',
+	'jet-char': 'assets/jet-char.png',
+	'jet': 'assets/jet.png',
+	'platform': 'assets/platform.png',
+	'left-btn': 'assets/left-btn.png',
+	'right-btn': 'assets/right-btn.png',
+	'start': 'assets/Start.png',
+	'music': 'assets/Music.png',
+	'music-off': 'assets/Musicoff.png',
+	'sfx': 'assets/SFX.png',
+	'sfx-off': 'assets/SFXoff.png',
+	'theme': 'assets/Theme.png',
+	'retry': 'assets/retry.png',
+	'main-menu': 'assets/main-menu.png',
+}
+ATLAS_PATH = 'assets/sprites'  # Prebuilt atlas: ATLAS_PATH + '.json' and one ATLAS_PATH + '-N.png' per page
+
+
+class Atlas():
+	def __init__(self, pages, rects):
+		if pygame.display.get_surface() is not None:
+			pages = [page.convert_alpha() for page in pages]
+		self.pages = pages  # Page surfaces
+		self.rects = rects  # name -> (page index, Rect on that page)
+		self.images = {name: pages[page].subsurface(rect) for name, (page, rect) in rects.items()}
+
+	def __getitem__(self, name):
+		return self.images[name]
+
+	def __contains__(self, name):
+		return name in self.images
+
+	def save(self, path):
+		# Write the pages as PNGs next to a JSON table of the rects
+		files = []
+		for index, page in enumerate(self.pages):
+			file = f'{path}-{index}.png'
+			pygame.image.save(page, file)
+			files.append(os.path.basename(file))
+		table = {name: [page, rect.x, rect.y, rect.width, rect.height] for name, (page, rect) in self.rects.items()}
+		with open(path + '.json', 'w') as file:
+			json.dump({'pages': files, 'rects': table}, file, indent=1)
+
+
+def pack(images, page_size=PAGE_SIZE):
+	# Shelf packing, tallest first: images go left to right along a shelf, and a new shelf starts below when
+	# the row is full; a new page starts when the page is full
+	order = sorted(images, key=lambda name: (-images[name].get_height(), name))
+	width = max([page_size] + [images[name].get_width() + 2 * PADDING for name in order])
+	places = {}
+	page_count = 0
+	x = y = shelf_height = 0
+	used = [[0, 0]]  # Width and height taken on each page
+	for name in order:
+		w, h = images[name].get_size()
+		w += 2 * PADDING
+		h += 2 * PADDING
+		if x + w > width:
+			x = 0
+			y += shelf_height
+			shelf_height = 0
+		if y + h > page_size and y > 0:
+			page_count += 1
+			used.append([0, 0])
+			x = y = shelf_height = 0
+		places[name] = (page_count, pygame.Rect(x + PADDING, y + PADDING, w - 2 * PADDING, h - 2 * PADDING))
+		x += w
+		shelf_height = max(shelf_height, h)
+		used[page_count][0] = max(used[page_count][0], x)
+		used[page_count][1] = max(used[page_count][1], y + h)
+
+	pages = [pygame.Surface(size, pygame.SRCALPHA) for size in used]
+	for name, (page, rect) in places.items():
+		# The page starts fully transparent, so taking the max copies the pixels, alpha included, unblended
+		pages[page].blit(images[name], rect, special_flags=pygame.BLEND_RGBA_MAX)
+	return Atlas(pages, places)
+
+
+def load_prebuilt(base_path, path, files, load):
+	# The atlas written by save(), or None if it is missing, incomplete or older than a source image
+	path = os.path.join(base_path, path)
+	try:
+		built = os.path.getmtime(path + '.json')
+		with open(path + '.json') as file:
+			table = json.load(file)
+	except Exception:
+		return None
+	for name, file in files.items():
+		if name not in table['rects']:
+			return None
+		source = os.path.join(base_path, file)
+		if os.path.exists(source) and os.path.getmtime(source) > built:
+			print("Sprite atlas is older than its images, packing at startup")
+			return None
+	directory = os.path.dirname(path)
+	pages = [load(os.path.join(directory, page)) for page in table['pages']]
+	rects = {name: (page, pygame.Rect(x, y, w, h)) for name, (page, x, y, w, h) in table['rects'].items()}
+	return Atlas(pages, rects)
+
+
+def load_atlas(base_path, files=SPRITE_FILES, load=pygame.image.load, path=ATLAS_PATH):
+	# files are relative to base_path; load opens one image file
+	atlas = None
+	try:
+		atlas = load_prebuilt(base_path, path, files, load)
+	except Exception as e:
+		print(f"Could not read the sprite atlas: {e}. Packing at startup.")
+	if atlas is None:
+		atlas = pack({name: load(os.path.join(base_path, file)) for name, file in files.items()})
+	return atlas
+
+
+if __name__ == '__main__':
+	# Build the atlas into assets/ so the game opens one or two files instead of one per image
+	base_path = sys.argv[1] if len(sys.argv) > 1 else '.'
+	atlas = pack({name: pygame.image.load(os.path.join(base_path, file)) for name, file in SPRITE_FILES.items()})
+	atlas.save(os.path.join(base_path, ATLAS_PATH))
+	for index, page in enumerate(atlas.pages):
+		print(f"Page {index}: {page.get_width()}x{page.get_height()}")
+	print(f"{len(atlas.rects)} images written to {os.path.join(base_path, ATLAS_PATH)}.json")
@@ -0,0 +1,74 @@
+#time reading frames back for capture on each backend and window scale, and check that every frame read
+#back is exactly the 400x600 frame that was drawn, whatever size the window is
+#usage: python benchmarks/bench_capture.py [surface] [sdl2] [sdl2-software] [--scales 1,2] [--frames 120]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pygame
+from render import create_renderer
+
+SCREEN_WIDTH = 400
+SCREEN_HEIGHT = 600
+
+
+def option(name, default):
+	flag = '--' + name
+	if flag in sys.argv[1:-1]:
+		return sys.argv[sys.argv.index(flag) + 1]
+	return default
+
+
+def draw(target, frame, blocks):
+	# A frame that differs each time and touches all four corners, so a crop or an offset shows
+	target.fill((30, 60, 90))
+	for i, block in enumerate(blocks):
+		x = (frame * 7 + i * 53) % (SCREEN_WIDTH - 20)
+		y = (frame * 3 + i * 97) % (SCREEN_HEIGHT - 20)
+		target.blit(block, (x, y))
+	for corner in ((0, 0), (SCREEN_WIDTH - 20, 0), (0, SCREEN_HEIGHT - 20), (SCREEN_WIDTH - 20, SCREEN_HEIGHT - 20)):
+		target.blit(blocks[0], corner)
+
+
+def bench(backend, scale, frames):
+	gfx = create_renderer(backend, (SCREEN_WIDTH, SCREEN_HEIGHT), 'Hop.It capture benchmark', scale)
+	blocks = []
+	for color in ((255, 0, 0), (0, 255, 0), (255, 255, 0), (255, 255, 255)):
+		block = pygame.Surface((20, 20))
+		block.fill(color)
+		blocks.append(block)
+	reference = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+	buffer = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+	gfx.start_readback()
+	spent = 0.0
+	mismatches = 0
+	for frame in range(frames):
+		draw(gfx, frame, blocks)
+		start = time.perf_counter()
+		gfx.read_pixels(buffer)
+		spent += time.perf_counter() - start
+		gfx.present()
+		draw(reference, frame, blocks)
+		if pygame.image.tobytes(buffer, 'RGB') != pygame.image.tobytes(reference, 'RGB'):
+			mismatches += 1
+	gfx.stop_readback()
+	gfx.close()
+	return spent * 1000 / frames, mismatches
+
+
+if __name__ == '__main__':
+	backends = [arg for arg in sys.argv[1:] if arg in ('surface', 'sdl2', 'sdl2-software')] or ['surface', 'sdl2-software']
+	scales = [float(scale) for scale in option('scales', '1,2').split(',')]
+	frames = int(option('frames', '120'))
+	pygame.init()
+	failed = False
+	for backend in backends:
+		for scale in scales:
+			if backend == 'surface' and scale != 1:
+				continue  # The display surface is not scaled
+			read_ms, mismatches = bench(backend, scale, frames)
+			result = 'identical' if mismatches == 0 else f'{mismatches} of {frames} frames differ'
+			print(f"{backend:<14} scale {scale:g}  read back {read_ms:6.3f} ms per frame, {result}")
+			failed = failed or mismatches > 0
+	sys.exit(1 if failed else 0)
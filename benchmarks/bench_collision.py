@@ -0,0 +1,89 @@
+#per-frame collision cost with rects alone and with collision masks behind the rect broadphase, on the
+#same seeded runs, against a budget; also the cost of a single mask test and how often one is needed
+#usage: python benchmarks/bench_collision.py [--frames 20000] [--seed 1] [--budget 20]
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pygame
+from atlas import load_atlas
+from collision import CollisionMasks
+from world import World
+
+
+def option(name, default):
+	flag = '--' + name
+	if flag in sys.argv[1:-1]:
+		return sys.argv[sys.argv.index(flag) + 1]
+	return default
+
+
+def random_inputs(rng, frames):
+	# Hold a direction for a few frames at a time, like a player would
+	inputs = []
+	while len(inputs) < frames:
+		choice = rng.choice(((False, False), (True, False), (False, True)))
+		inputs += [choice] * rng.randint(1, 20)
+	return inputs[:frames]
+
+
+def run(world, inputs):
+	# Time spent in the hero update, where all collisions are checked, per frame (us)
+	spent = 0.0
+	runs = 1
+	for key_left, key_right in inputs:
+		world.hero.key_left = key_left
+		world.hero.key_right = key_right
+		start = time.perf_counter()
+		world.update_hero()
+		spent += time.perf_counter() - start
+		world.spawn()
+		world.update_entities()
+		if world.end_state:
+			world.reset()
+			runs += 1
+	return spent * 1e6 / len(inputs), runs
+
+
+if __name__ == '__main__':
+	frames = int(option('frames', '20000'))
+	seed = int(option('seed', '1'))
+	budget = float(option('budget', '20'))  # Collision time allowed per frame (us)
+	atlas = load_atlas('.')
+	hero_sprites = {'jump1': atlas['jump1'], 'jump2': atlas['jump2'], 'jump3': atlas['jump3'], 'jet': atlas['jet-char']}
+	pickup_sprites = {'jet': atlas['jet']}
+	pickup_sizes = {name: sprite.get_size() for name, sprite in pickup_sprites.items()}
+
+	start = time.perf_counter()
+	masks = CollisionMasks(hero_sprites, pickup_sprites, atlas['platform'])
+	print(f"masks built in {(time.perf_counter() - start) * 1000:.1f} ms ({len(masks.floors)} platform widths)")
+
+	inputs = random_inputs(random.Random(seed), frames)
+	rect_us, rect_runs = run(World(seed, pickup_sizes), inputs)
+	mask_us, mask_runs = run(World(seed, pickup_sizes, masks), inputs)
+	print(f"{frames} frames, hero update per frame (collisions included):")
+	print(f"rects         {rect_us:8.2f} us  ({rect_runs} runs)")
+	print(f"rects + masks {mask_us:8.2f} us  ({mask_runs} runs, {masks.checks / frames:.3f} mask tests per frame)")
+
+	# A single mask test, for a hitbox resting on the middle of a platform and one on a pickup
+	world = World(seed, pickup_sizes, masks)
+	hero = world.hero
+	floor = next(iter(world.floor_group))
+	hero.x = floor.x + floor.width / 2 - hero.width / 2
+	pickup = pygame.sprite.Sprite()
+	pickup.kind = 'jet'
+	pickup.x, pickup.y = hero.x, hero.y
+	repeat = 100000
+	start = time.perf_counter()
+	for i in range(repeat):
+		masks.lands(hero, floor)
+	lands_us = (time.perf_counter() - start) * 1e6 / repeat
+	start = time.perf_counter()
+	for i in range(repeat):
+		masks.touches(hero, pickup)
+	touches_us = (time.perf_counter() - start) * 1e6 / repeat
+	print(f"landing test  {lands_us:8.2f} us")
+	print(f"pickup test   {touches_us:8.2f} us")
+	print(f"budget        {budget:8.2f} us per frame: " + ('within' if mask_us <= budget else 'OVER'))
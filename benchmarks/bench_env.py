@@ -0,0 +1,78 @@
+#environment steps per second: one HopEnv in this process against VectorEnv workers with shared-memory observations,
+#and check that a seeded reset replays the same episode whatever ran before it
+#usage: python benchmarks/bench_env.py [features|pixels] [--envs 8] [--workers 4] [--steps 2000]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import numpy as np
+from env import HopEnv, VectorEnv
+
+
+def option(name, default):
+	flag = '--' + name
+	if flag in sys.argv[1:-1]:
+		return sys.argv[sys.argv.index(flag) + 1]
+	return default
+
+
+def episode(env, seed, actions):
+	# Observations of a seeded episode, copied since the next step overwrites obs
+	obs, info = env.reset(seed=seed)
+	seen = [obs.copy()]
+	for action in actions:
+		obs, reward, terminated, truncated, info = env.step(action)
+		seen.append(obs.copy())
+		if terminated or truncated:
+			break
+	return seen
+
+
+def same_episodes(first, second):
+	return len(first) == len(second) and all(np.array_equal(a, b) for a, b in zip(first, second))
+
+
+if __name__ == '__main__':
+	observation = 'pixels' if 'pixels' in sys.argv[1:] else 'features'
+	num_envs = int(option('envs', '8'))
+	workers = int(option('workers', str(min(num_envs, os.cpu_count() or 1))))
+	steps = int(option('steps', '2000'))
+	rng = np.random.default_rng(0)
+
+	env = HopEnv(observation, seed=0)
+	env.reset()
+	start = time.perf_counter()
+	for step in range(steps):
+		obs, reward, terminated, truncated, info = env.step(rng.integers(3))
+		if terminated or truncated:
+			env.reset()
+	single = steps / (time.perf_counter() - start)
+	print(f"{observation} obs {env.observation_shape}")
+	print(f"1 env, this process      {single:10,.0f} steps/s")
+
+	vector = VectorEnv(num_envs, observation, workers=workers)
+	vector.reset()
+	rounds = max(1, steps // num_envs)
+	start = time.perf_counter()
+	for step in range(rounds):
+		vector.step(rng.integers(3, size=num_envs))
+	total = rounds * num_envs / (time.perf_counter() - start)
+	vector.close()
+	print(f"{num_envs} envs, {workers} workers     {total:10,.0f} steps/s ({total / single:.1f}x)")
+
+	# The same seed and actions must give the same observations on a fresh env, straight after that
+	# episode, and after an unrelated episode that ended in a fall (the hero dies falling fast)
+	actions = rng.integers(3, size=300)
+	env = HopEnv(observation)
+	reference = episode(env, 7, actions)
+	repeated = episode(env, 7, actions)
+	env.reset(seed=8)
+	for step in range(env.max_steps):
+		obs, reward, terminated, truncated, info = env.step(rng.integers(3))
+		if terminated or truncated:
+			break
+	after_fall = episode(env, 7, actions)
+	failed = not (same_episodes(reference, repeated) and same_episodes(reference, after_fall))
+	print(f"seeded reset: {len(reference)} steps " + ('identical' if not failed else 'DIFFER'))
+	sys.exit(1 if failed else 0)
@@ -0,0 +1,120 @@
+#CPU used by the game on its static screens (home after the intro, game over once the buttons are in),
+#with idle mode on and off; the game runs in a child process with dummy video and audio drivers and is
+#driven by posted events, and the child's CPU time is sampled while it sits on each screen
+#the player's best score and saved run are put back afterwards
+#usage: python benchmarks/bench_idle.py [--seconds 5]
+import os
+import sys
+import time
+import threading
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from savestate import SAVE_NAME
+SETTLE = 2.5  # Seconds for a screen's intro to finish and idle mode to kick in
+
+
+def option(name, default):
+	flag = '--' + name
+	if flag in sys.argv[1:-1]:
+		return sys.argv[sys.argv.index(flag) + 1]
+	return default
+
+
+def click(pygame, pos):
+	pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1))
+	time.sleep(0.05)
+	pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONUP, pos=pos, button=1))
+
+def cpu_percent(seconds):
+	# Share of one core used by this process over the next seconds
+	start_cpu = time.process_time()
+	start = time.perf_counter()
+	time.sleep(seconds)
+	return (time.process_time() - start_cpu) / (time.perf_counter() - start) * 100
+
+
+def drive(pygame, seconds):
+	# Runs next to the game loop; pygame.event.post is safe from another thread
+	results = []
+	time.sleep(SETTLE)
+	game = sys.modules['__main__']  # The game's globals while runpy runs main.py
+	if game.scenes.state != game.GAME_STATE_HOME:
+		print('error: the game did not start on the home screen', flush=True)
+	results.append(cpu_percent(seconds))
+	click(pygame, (200, 300))  # Start
+	time.sleep(0.5)
+	# Drop the hero below the screen: input alone can land it on another platform and keep the run going
+	world = game.world
+	world.hero.y = world.camera_y + 2 * game.SCREEN_HEIGHT
+	deadline = time.perf_counter() + 5
+	while game.scenes.state != game.GAME_STATE_OVER and time.perf_counter() < deadline:
+		time.sleep(0.05)
+	if game.scenes.state != game.GAME_STATE_OVER:
+		print('error: the run did not end', flush=True)
+	time.sleep(SETTLE)
+	results.append(cpu_percent(seconds))
+	print('result', *(f'{result:.1f}' for result in results), flush=True)
+	pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+
+def child(seconds):
+	os.environ['SDL_VIDEODRIVER'] = 'dummy'
+	os.environ['SDL_AUDIODRIVER'] = 'dummy'
+	os.chdir(ROOT)
+	import runpy
+	import pygame
+	pygame.init()
+	threading.Thread(target=drive, args=(pygame, seconds), daemon=True).start()
+	runpy.run_path(os.path.join(ROOT, 'main.py'), run_name='__main__')
+
+
+def backup(path):
+	if not os.path.exists(path):
+		return None
+	with open(path, 'rb') as file:
+		return file.read()
+
+def put_back(path, data):
+	if data is None:
+		if os.path.exists(path):
+			os.remove(path)
+	else:
+		with open(path, 'wb') as file:
+			file.write(data)
+
+
+def measure(idle, seconds):
+	# The run can write a new best score, and a saved run would make the game launch straight into it,
+	# so the child starts without a save and the player's files are put back after
+	paths = [os.path.join(ROOT, 'score.txt'), os.path.join(ROOT, SAVE_NAME)]
+	saved = [backup(path) for path in paths]
+	env = dict(os.environ, HOPIT_IDLE='1' if idle else '0')
+	try:
+		if os.path.exists(paths[1]):
+			os.remove(paths[1])
+		output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', str(seconds)], env=env,
+								capture_output=True, text=True).stdout
+	finally:
+		for path, data in zip(paths, saved):
+			put_back(path, data)
+	for line in output.splitlines():
+		if line.startswith('error'):
+			raise RuntimeError(line)
+	for line in output.splitlines():
+		if line.startswith('result'):
+			return [float(value) for value in line.split()[1:]]
+	raise RuntimeError('The game did not report: ' + output[-500:])
+
+
+if __name__ == '__main__':
+	if '--child' in sys.argv:
+		child(float(option('child', '5')))
+	else:
+		seconds = float(option('seconds', '5'))
+		print(f"CPU use over {seconds:g} s on each screen (% of one core)")
+		print(f"{'':<12}{'home':>8}{'game over':>12}")
+		for idle in (False, True):
+			home, game_over = measure(idle, seconds)
+			print(f"{'idle ' + ('on' if idle else 'off'):<12}{home:>7.1f}%{game_over:>11.1f}%")
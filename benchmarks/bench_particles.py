@@ -0,0 +1,50 @@
+#particle update and draw cost on the software renderer at several live particle counts
+#usage: python benchmarks/bench_particles.py [--frames 300] [--counts 500,2000,5000,8000]
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pygame
+from render import SurfaceRenderer
+from particles import ParticleSystem, EXHAUST, DUST
+
+
+def option(name, default):
+	flag = '--' + name
+	if flag in sys.argv[1:-1]:
+		return sys.argv[sys.argv.index(flag) + 1]
+	return default
+
+
+if __name__ == '__main__':
+	pygame.init()
+	frames = int(option('frames', '300'))
+	counts = [int(count) for count in option('counts', '500,2000,5000,8000').split(',')]
+	gfx = SurfaceRenderer((400, 600), 'Hop.It benchmark')
+	for target in counts:
+		particles = ParticleSystem(max(target * 2, 1024))
+		update_time = 0.0
+		draw_time = 0.0
+		live = 0
+		camera_y = 0.0
+		for frame in range(frames + 30):
+			# Top the pool up to the target, spread over the screen, with a steady camera scroll
+			camera_y -= 2
+			missing = target - len(particles)
+			if missing > 0:
+				particles.emit(EXHAUST if frame % 2 else DUST, missing, 200 + 150 * math.sin(frame), camera_y + 300, 4, math.pi / 2, math.pi, 40)
+			gfx.fill((135, 206, 235))
+			start = time.perf_counter()
+			particles.update(camera_y)
+			middle = time.perf_counter()
+			particles.draw(gfx, camera_y)
+			end = time.perf_counter()
+			gfx.present()
+			if frame >= 30:  # Skip the ramp-up
+				update_time += middle - start
+				draw_time += end - middle
+				live += len(particles)
+		print(f"{live / frames:7.0f} live  update {update_time * 1000 / frames:6.3f} ms  draw {draw_time * 1000 / frames:6.3f} ms")
+	pygame.quit()
@@ -0,0 +1,68 @@
+#compare render backends on a frame shaped like gameplay (background layers, platforms, hero, buttons, text)
+#usage: python benchmarks/bench_render.py [surface] [sdl2] [sdl2-software] [--scale 2] [--frames 600]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pygame
+from render import create_renderer
+from atlas import load_atlas
+
+SCREEN_WIDTH = 400
+SCREEN_HEIGHT = 600
+
+
+def option(name, default):
+	flag = '--' + name
+	if flag in sys.argv[1:-1]:
+		return sys.argv[sys.argv.index(flag) + 1]
+	return default
+
+
+def bench(backend, frames, scale):
+	gfx = create_renderer(backend, (SCREEN_WIDTH, SCREEN_HEIGHT), 'Hop.It benchmark', scale)
+	def load(name):
+		image = pygame.image.load(os.path.join('assets', name))
+		return image.convert_alpha() if pygame.display.get_surface() is not None else image
+	base = load('base.png')
+	clouds = load('clouds.png')
+	background = load('bg.png')
+	atlas = load_atlas('.')  # Sprites and buttons come from the atlas, as in the game
+	platform = atlas['platform']
+	hero = atlas['jump1']
+	buttons = [atlas['left-btn'], atlas['right-btn']]
+	font = pygame.font.SysFont('Lucida Sans', 24, bold=True)
+	text = font.render('1234', True, (245, 169, 25))
+	platforms = [(37 * i % 340, 60 * i, 40 + i * 2) for i in range(10)]
+
+	start = time.perf_counter()
+	for frame in range(frames):
+		offset = frame % 600
+		gfx.fill((135, 206, 235))
+		gfx.blit(base, (0, 0))
+		gfx.blit(clouds, (0, offset))
+		gfx.blit(clouds, (0, offset - 600))
+		gfx.blit(background, (0, offset))
+		gfx.blit(background, (0, offset - 600))
+		for x, y, width in platforms:
+			gfx.blit_transformed(platform, (x, (y + frame) % 600), size=(width, 20))
+		gfx.blit_transformed(hero, (180, 300), flip_x=frame % 60 < 30)
+		gfx.blit(buttons[0], (30, 500))
+		gfx.blit(buttons[1], (300, 500))
+		gfx.blit(text, (10, 5))
+		gfx.present()
+		pygame.event.pump()
+	elapsed = time.perf_counter() - start
+	gfx.close()
+	return elapsed * 1000 / frames
+
+
+if __name__ == '__main__':
+	pygame.init()
+	frames = int(option('frames', '600'))
+	scale = float(option('scale', '1'))
+	backends = [arg for arg in sys.argv[1:] if arg in ('surface', 'sdl2', 'sdl2-software')] or ['surface', 'sdl2-software']
+	for backend in backends:
+		print(f"{backend:<14} scale {scale:g}: {bench(backend, frames, scale):.3f} ms/frame")
+	pygame.quit()
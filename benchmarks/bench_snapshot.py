@@ -0,0 +1,91 @@
+#time World.snapshot/restore on states from a headless run, and check a restored world replays identically
+#usage: python benchmarks/bench_snapshot.py [--frames 3000] [--repeat 20000] [--seed 1]
+import copy
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from world import World
+
+
+def option(name, default):
+	flag = '--' + name
+	if flag in sys.argv[1:-1]:
+		return sys.argv[sys.argv.index(flag) + 1]
+	return default
+
+
+def play(world, inputs):
+	# inputs: (key_left, key_right) per frame; a fallen hero starts a new run
+	for key_left, key_right in inputs:
+		world.hero.key_left = key_left
+		world.hero.key_right = key_right
+		world.step()
+		if world.end_state:
+			world.reset()
+
+
+def random_inputs(rng, frames):
+	# Hold a direction for a few frames at a time, like a player would
+	inputs = []
+	while len(inputs) < frames:
+		choice = rng.choice(((False, False), (True, False), (False, True)))
+		inputs += [choice] * rng.randint(1, 20)
+	return inputs[:frames]
+
+
+def timed(function, states, repeat):
+	start = time.perf_counter()
+	for i in range(repeat):
+		function(states[i % len(states)])
+	return (time.perf_counter() - start) * 1e6 / repeat
+
+
+if __name__ == '__main__':
+	frames = int(option('frames', '3000'))
+	repeat = int(option('repeat', '20000'))
+	seed = int(option('seed', '1'))
+	rng = random.Random(seed)
+	world = World(seed)
+
+	# Collect states from a run so snapshots cover jets, moving floors and restarts
+	states = []
+	chunks = []
+	for chunk in range(frames // 10):
+		chunks.append(random_inputs(rng, 10))
+		play(world, chunks[-1])
+		states.append(world.snapshot())
+	floors = sum(len(state[1]) // 7 for state in states) / len(states)
+	print(f"{len(states)} states, {floors:.1f} floors on average")
+
+	snapshot_us = timed(lambda state: world.snapshot(), states, repeat)
+	restore_us = timed(world.restore, states, repeat)
+	print(f"snapshot      {snapshot_us:8.2f} us")
+	print(f"restore       {restore_us:8.2f} us")
+	print(f"round trip    {snapshot_us + restore_us:8.2f} us  ({1e6 / (snapshot_us + restore_us):,.0f} per second)")
+
+	# Lookahead: branch from one root state, ten frames per branch
+	root = states[len(states) // 2]
+	branch = random_inputs(rng, 10)
+	branches = max(1, repeat // 10)
+	start = time.perf_counter()
+	for i in range(branches):
+		world.restore(root)
+		play(world, branch)
+	branch_us = (time.perf_counter() - start) * 1e6 / branches
+	print(f"lookahead     {branch_us:8.2f} us per 10-frame branch ({1e6 / branch_us:,.0f} per second)")
+
+	# Reference point: deep-copying the sprite objects
+	deepcopy_us = timed(lambda state: copy.deepcopy(world), states, max(1, repeat // 20))
+	print(f"deepcopy      {deepcopy_us:8.2f} us")
+
+	# A restored world must replay the next chunk of input exactly as the original run did
+	mismatches = 0
+	for i in range(len(states) - 1):
+		world.restore(states[i])
+		play(world, chunks[i + 1])
+		if world.snapshot() != states[i + 1]:
+			mismatches += 1
+	print('replay after restore: ' + ('identical' if mismatches == 0 else f'{mismatches} mismatches'))
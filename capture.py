@@ -0,0 +1,129 @@
+#gameplay capture: each frame is copied into a preallocated buffer and written to disk by a background thread
+#formats: y4m (raw YUV 4:4:4 video, needs numpy) or png (numbered image sequence)
+import os
+import queue
+import importlib.util
+import threading
+import time
+import pygame
+
+POOL_SIZE = 16  # Frames that can wait for the writer before new ones are dropped
+
+
+class FrameCapture():
+	def __init__(self, gfx, fps, output_dir='.', pool_size=POOL_SIZE):
+		self.gfx = gfx
+		self.size = gfx.size  # Frames are captured at the game's logical size, whatever the window's
+		self.fps = fps
+		self.output_dir = output_dir
+		self.pool_size = pool_size
+		self.active = False
+		self.thread = None
+		self.path = None
+		self.captured = 0
+		self.dropped = 0
+		self.written = 0
+
+	def start(self, format='y4m'):
+		if self.thread is not None:
+			return
+		if format == 'y4m' and importlib.util.find_spec('numpy') is None:
+			print("Y4M capture needs numpy, capturing PNG frames instead.")
+			format = 'png'
+		self.format = format
+		stamp = time.strftime('%Y%m%d-%H%M%S')
+		if format == 'y4m':
+			self.path = os.path.join(self.output_dir, f'hopit-capture-{stamp}.y4m')
+		else:
+			self.path = os.path.join(self.output_dir, f'hopit-capture-{stamp}')
+			os.makedirs(self.path, exist_ok=True)
+		# Buffers are allocated once; the game loop only ever copies into a free one
+		self.free = queue.Queue()
+		for i in range(self.pool_size):
+			self.free.put(pygame.Surface(self.size))
+		self.filled = queue.Queue()
+		self.captured = 0
+		self.dropped = 0
+		self.written = 0
+		self.active = True
+		self.gfx.start_readback()
+		self.thread = threading.Thread(target=self.write_frames, name='capture writer', daemon=True)
+		self.thread.start()
+
+	def grab(self):
+		# Called once per frame before presenting: one copy of the frame, or a drop if the writer is behind
+		if not self.active:
+			return
+		try:
+			buffer = self.free.get_nowait()
+		except queue.Empty:
+			self.dropped += 1
+			return
+		self.gfx.read_pixels(buffer)
+		self.filled.put(buffer)
+		self.captured += 1
+
+	def write_frames(self):
+		try:
+			if self.format == 'y4m':
+				self.write_y4m()
+			else:
+				self.write_png()
+		except Exception as e:
+			print(f"Capture stopped: {e}")
+			self.active = False
+			# Keep returning buffers so a stopping game loop never waits on a dead writer
+			while True:
+				buffer = self.filled.get()
+				if buffer is None:
+					break
+
+	def write_png(self):
+		while True:
+			buffer = self.filled.get()
+			if buffer is None:
+				break
+			pygame.image.save(buffer, os.path.join(self.path, f'{self.written:06d}.png'))
+			self.written += 1
+			self.free.put(buffer)
+
+	def write_y4m(self):
+		import numpy as np
+		width, height = self.size
+		# BT.601 full-range RGB -> YUV
+		matrix = np.array([[0.299, 0.587, 0.114],
+						   [-0.168736, -0.331264, 0.5],
+						   [0.5, -0.418688, -0.081312]], np.float32)
+		offset = np.array([0, 128, 128], np.float32)
+		planes = np.empty((3, height, width), np.uint8)
+		with open(self.path, 'wb') as file:
+			file.write(f'YUV4MPEG2 W{width} H{height} F{self.fps}:1 Ip A1:1 C444\n'.encode())
+			while True:
+				buffer = self.filled.get()
+				if buffer is None:
+					break
+				pixels = pygame.surfarray.pixels3d(buffer)  # Columns x rows view, no copy
+				yuv = np.tensordot(pixels.transpose(1, 0, 2).astype(np.float32), matrix, ([2], [1])) + offset
+				del pixels  # Unlock the buffer before handing it back
+				self.free.put(buffer)
+				np.clip(yuv, 0, 255, out=yuv)
+				planes[...] = yuv.transpose(2, 0, 1)
+				file.write(b'FRAME\n')
+				file.write(planes.tobytes())
+				self.written += 1
+
+	def stop(self):
+		if self.thread is None:
+			return
+		self.active = False
+		self.gfx.stop_readback()
+		self.filled.put(None)
+		self.thread.join()
+		self.thread = None
+		print(f"Capture written to {self.path}: {self.written} frames, {self.dropped} dropped")
+
+	def toggle(self, format='y4m'):
+		if self.thread is not None:
+			self.stop()
+		else:
+			self.start(format)
@@ -0,0 +1,69 @@
+#collision masks: pixel outlines of the hero, pickup and platform sprites, made once when the game starts
+#collisions are still found with rects first (cheap, and a miss nearly every frame); a mask only settles the
+#few frames where the rects touch, so the hero no longer lands on a platform's transparent ends or collects
+#a pickup by its empty corners
+#landings compare columns (which x the hero's feet and the platform's solid part cover) and leave the
+#vertical rules to the hitbox, so where the hero stands and how high it bounces don't change
+import pygame
+from world import FLOOR_HEIGHT
+
+HERO_OFFSET = (-12, -5)  # Where the hero sprite is drawn relative to the hitbox's top-left corner
+FEET = 1 / 3  # Share of the hero sprite, from the bottom, that can stand on a platform
+FLOOR_WIDTHS = (40, 60, 100)  # Narrowest and widest spawned platform, and the starting one
+
+
+class CollisionMasks():
+	def __init__(self, hero_sprites, pickup_sprites, floor_sprite):
+		# hero_sprites: animation frame -> surface, pickup_sprites: power-up name -> surface
+		self.hero = {}  # (frame, facing left) -> mask of the whole sprite
+		self.feet = {}  # (frame, facing left) -> one-row mask of the columns the feet cover
+		for name, sprite in hero_sprites.items():
+			for flipped in (False, True):
+				mask = pygame.mask.from_surface(pygame.transform.flip(sprite, True, False) if flipped else sprite)
+				height = mask.get_size()[1]
+				self.hero[name, flipped] = mask
+				self.feet[name, flipped] = columns(mask, height - max(1, int(height * FEET)), height)
+		self.pickups = {name: pygame.mask.from_surface(sprite) for name, sprite in pickup_sprites.items()}
+		self.floor_sprite = floor_sprite
+		self.floors = {}  # Platform width -> one-row mask of its solid columns
+		for width in range(FLOOR_WIDTHS[0], FLOOR_WIDTHS[1] + 1):
+			self.floor(width)
+		self.floor(FLOOR_WIDTHS[2])
+		self.checks = 0  # Mask tests so far, i.e. rect hits that needed a closer look
+
+	def floor(self, width):
+		mask = self.floors.get(width)
+		if mask is None:
+			# Platforms are drawn scaled to their width, so each width has its own outline
+			image = pygame.transform.scale(self.floor_sprite, (width, FLOOR_HEIGHT))
+			mask = columns(pygame.mask.from_surface(image), 0, FLOOR_HEIGHT)
+			self.floors[width] = mask
+		return mask
+
+	def lands(self, hero, floor):
+		# Called once the hitbox has landed on floor: do the feet cover a solid part of it?
+		self.checks += 1
+		offset = round(floor.x) - round(hero.x) - HERO_OFFSET[0]
+		return self.feet[hero.sprite, hero.facing_left].overlap(self.floor(floor.width), (offset, 0)) is not None
+
+	def touches(self, hero, pickup):
+		# Called once the hitbox overlaps pickup: do the drawn pixels overlap?
+		mask = self.pickups.get(pickup.kind)
+		if mask is None:
+			return True  # A power-up without a sprite keeps its rect
+		self.checks += 1
+		offset = (round(pickup.x) - round(hero.x) - HERO_OFFSET[0], round(pickup.y) - round(hero.y) - HERO_OFFSET[1])
+		return self.hero[hero.sprite, hero.facing_left].overlap(mask, offset) is not None
+
+
+def columns(mask, top, bottom):
+	# One-row mask with a bit in every column that has one between rows top and bottom;
+	# an outline with nothing there (a sprite without transparency) covers every column
+	width = mask.get_size()[0]
+	row = pygame.mask.Mask((width, 1))
+	for x in range(width):
+		if any(mask.get_at((x, y)) for y in range(top, bottom)):
+			row.set_at((x, 0))
+	if not row.count():
+		row.fill()
+	return row
@@ -0,0 +1,275 @@
+#reinforcement learning environment: reset/step API over the headless World, plus a vectorized
+#version that steps many environments in worker processes with observations in shared memory
+#needs numpy (pip install numpy); the game itself does not
+import os
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+import pygame
+from world import World, SCREEN_WIDTH, SCREEN_HEIGHT
+from atlas import load_atlas
+from collision import HERO_OFFSET
+
+ACTIONS = ('left', 'none', 'right')
+NEAREST_FLOORS = 5  # Platforms described in the feature vector, nearest first
+FEATURE_SIZE = 4 + NEAREST_FLOORS * 4 + 3
+FRAME_SHAPE = (SCREEN_HEIGHT, SCREEN_WIDTH, 3)  # Rows, columns, RGB
+SKY_BLUE = (135, 206, 235)
+
+
+#sprites for rendered observations, loaded once per process (no display needed)
+#names are the game's atlas regions, except the base image which isn't in the atlas
+SPRITE_NAMES = {'jump1': 'jump1', 'jump2': 'jump2', 'jump3': 'jump3', 'jet': 'jet-char', 'pickup': 'jet',
+				'platform': 'platform'}
+sprites = {}
+
+def load_sprites():
+	if not sprites:
+		base_path = os.path.dirname(os.path.abspath(__file__))
+		atlas = load_atlas(base_path)
+		for name, region in SPRITE_NAMES.items():
+			sprites[name] = atlas[region]
+		sprites['base'] = pygame.image.load(os.path.join(base_path, 'assets', 'base.png'))
+		sprites['platforms'] = {}  # Platform scaled to each width
+	return sprites
+
+
+class HopEnv():
+	# observation is 'features' (float32 vector) or 'pixels' (uint8 frame, rows x columns x RGB)
+	# buffer optionally supplies the memory the observation is written to (shared memory)
+	def __init__(self, observation='features', seed=None, max_steps=10000, frame_skip=1, buffer=None):
+		if observation not in ('features', 'pixels'):
+			raise ValueError(f"Unknown observation mode: {observation}")
+		self.observation = observation
+		if observation == 'pixels':
+			self.sprites = load_sprites()
+			self.world = World(seed, {'jet': self.sprites['pickup'].get_size()})
+		else:
+			self.world = World(seed)
+		self.max_steps = max_steps
+		self.frame_skip = frame_skip  # Frames the action is held for per step
+		self.steps = 0
+		if observation == 'features':
+			self.obs = np.ndarray((FEATURE_SIZE,), np.float32, buffer=buffer)
+		else:
+			self.obs = np.ndarray(FRAME_SHAPE, np.uint8, buffer=buffer)
+			# The frame surface draws straight into the observation array, so there is nothing to copy.
+			# (surfarray.pixels3d would lock the surface and block blits while the array is alive.)
+			self.frame = pygame.image.frombuffer(self.obs, (SCREEN_WIDTH, SCREEN_HEIGHT), 'RGB')
+			# Sky and base flattened once, in the frame's pixel format so the per-step copy is a plain blit
+			self.backdrop = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), 0, self.frame)
+			self.backdrop.fill(SKY_BLUE)
+			self.backdrop.blit(self.sprites['base'], (0, 0))
+
+	@property
+	def observation_shape(self):
+		return self.obs.shape
+
+	def reset(self, seed=None):
+		if seed is not None:
+			self.world.rng.seed(seed)
+		self.world.reset()
+		self.steps = 0
+		self.observe()
+		return self.obs, {'height': 0}
+
+	def step(self, action):
+		# Returns obs, reward, terminated, truncated, info; obs is reused by the next step, copy it to keep it
+		world = self.world
+		hero = world.hero
+		start_height = world.player_height
+		for frame in range(self.frame_skip):
+			hero.key_left = action == 0
+			hero.key_right = action == 2
+			world.step()
+			if world.end_state:
+				break
+		self.steps += 1
+		self.observe()
+		reward = world.player_height - start_height
+		truncated = self.steps >= self.max_steps and not world.end_state
+		return self.obs, reward, world.end_state, truncated, {'height': world.player_height}
+
+	def observe(self):
+		if self.observation == 'features':
+			self.write_features(self.obs)
+		else:
+			self.draw(self.frame)
+
+	def write_features(self, out):
+		# Hero position and state, then the nearest platforms and a power-up relative to the hero
+		world = self.world
+		hero = world.hero
+		x = hero.x + hero.width / 2
+		y = hero.y + hero.height / 2
+		out[0] = x / SCREEN_WIDTH
+		out[1] = (y - world.camera_y) / SCREEN_HEIGHT
+		out[2] = hero.vertical_speed / 15
+		out[3] = hero.has_jet
+		floors = sorted(world.floor_group, key=lambda floor: abs(floor.y + floor.height / 2 - y))
+		i = 4
+		for n in range(NEAREST_FLOORS):
+			if n < len(floors):
+				floor = floors[n]
+				out[i:i + 4] = ((floor.x + floor.width / 2 - x) / SCREEN_WIDTH, (floor.y - hero.y - hero.height) / SCREEN_HEIGHT,
+								floor.width / SCREEN_WIDTH, floor.is_moving)
+			else:
+				out[i:i + 4] = 0
+			i += 4
+		for pickup in world.pickup_group:
+			out[i:i + 3] = ((pickup.x + pickup.width / 2 - x) / SCREEN_WIDTH, (pickup.y + pickup.height / 2 - y) / SCREEN_HEIGHT, 1)
+			break
+		else:
+			out[i:i + 3] = 0
+
+	def draw(self, surface):
+		# Gameplay layers without the scrolling decoration
+		sprites = self.sprites
+		surface.blit(self.backdrop, (0, 0))
+		platforms = sprites['platforms']
+		world = self.world
+		camera_y = world.camera_y
+		for floor in world.floor_group:
+			if not world.on_screen(floor):
+				continue
+			size = (floor.width, floor.height)
+			if size not in platforms:
+				platforms[size] = pygame.transform.scale(sprites['platform'], size)
+			surface.blit(platforms[size], (round(floor.x), round(floor.y - camera_y)))
+		for pickup in world.pickup_group:
+			if world.on_screen(pickup):
+				surface.blit(sprites['pickup'], (round(pickup.x), round(pickup.y - camera_y)))
+		hero = world.hero
+		image = sprites[hero.sprite]
+		if hero.facing_left:
+			image = pygame.transform.flip(image, True, False)
+		surface.blit(image, (round(hero.x) + HERO_OFFSET[0], round(hero.y - camera_y) + HERO_OFFSET[1]))
+
+	def close(self):
+		pass
+
+
+#worker process: steps its share of the environments, writing into shared memory
+def worker(conn, names, observation, first, count, seeds, max_steps, frame_skip):
+	obs_memory = shared_memory.SharedMemory(name=names[0])
+	result_memory = shared_memory.SharedMemory(name=names[1])
+	total = len(seeds)
+	obs, final_obs = observation_arrays(obs_memory, observation, total)
+	rewards, terminated, truncated = result_arrays(result_memory, total)
+	envs = [HopEnv(observation, seeds[first + i], max_steps, frame_skip, obs[first + i]) for i in range(count)]
+	try:
+		while True:
+			command, data = conn.recv()
+			if command == 'step':
+				for i, env in enumerate(envs):
+					index = first + i
+					ob, reward, done, cut, info = env.step(data[i])
+					rewards[index] = reward
+					terminated[index] = done
+					truncated[index] = cut
+					if done or cut:
+						# Start the next episode right away; the first frame of it is the observation,
+						# and the last frame of the one that ended is kept in final_obs
+						final_obs[index] = ob
+						env.reset()
+				conn.send(None)
+			elif command == 'reset':
+				for env in envs:
+					env.reset()
+				conn.send(None)
+			elif command == 'close':
+				break
+	finally:
+		del obs, final_obs, rewards, terminated, truncated, envs
+		obs_memory.close()
+		result_memory.close()
+		conn.close()
+
+
+def observation_arrays(memory, observation, count):
+	# Current observations, then the final observation of each environment's last finished episode
+	shape = (count, FEATURE_SIZE) if observation == 'features' else (count,) + FRAME_SHAPE
+	dtype = np.float32 if observation == 'features' else np.uint8
+	size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+	return (np.ndarray(shape, dtype, buffer=memory.buf),
+			np.ndarray(shape, dtype, buffer=memory.buf, offset=size))
+
+def result_arrays(memory, count):
+	rewards = np.ndarray((count,), np.float32, buffer=memory.buf)
+	terminated = np.ndarray((count,), np.bool_, buffer=memory.buf, offset=count * 4)
+	truncated = np.ndarray((count,), np.bool_, buffer=memory.buf, offset=count * 5)
+	return rewards, terminated, truncated
+
+
+class VectorEnv():
+	# num_envs environments spread over workers processes; episodes restart automatically when they end
+	# obs, rewards, terminated and truncated are views into shared memory, overwritten by the next step
+	# where an episode ended, obs already holds the next episode's first observation and final_obs the last one
+	def __init__(self, num_envs, observation='features', seed=0, workers=None, max_steps=10000, frame_skip=1):
+		self.num_envs = num_envs
+		workers = min(num_envs, workers or os.cpu_count() or 1)
+		obs_size = FEATURE_SIZE * 4 if observation == 'features' else int(np.prod(FRAME_SHAPE))
+		self.obs_memory = shared_memory.SharedMemory(create=True, size=2 * num_envs * obs_size)
+		self.result_memory = shared_memory.SharedMemory(create=True, size=num_envs * 6)
+		self.obs, self.final_obs = observation_arrays(self.obs_memory, observation, num_envs)
+		self.rewards, self.terminated, self.truncated = result_arrays(self.result_memory, num_envs)
+		seeds = [seed + i for i in range(num_envs)]
+		names = (self.obs_memory.name, self.result_memory.name)
+
+		# Split the environments into contiguous slices, one per worker
+		context = multiprocessing.get_context('spawn')
+		self.connections = []
+		self.processes = []
+		self.slices = []
+		first = 0
+		for n in range(workers):
+			count = num_envs // workers + (1 if n < num_envs % workers else 0)
+			parent, child = context.Pipe()
+			process = context.Process(target=worker, daemon=True,
+									  args=(child, names, observation, first, count, seeds, max_steps, frame_skip))
+			process.start()
+			child.close()
+			self.connections.append(parent)
+			self.processes.append(process)
+			self.slices.append((first, first + count))
+			first += count
+		self.closed = False
+
+	def reset(self):
+		for conn in self.connections:
+			conn.send(('reset', None))
+		for conn in self.connections:
+			conn.recv()
+		return self.obs
+
+	def step(self, actions):
+		# actions: one of 0 (left), 1 (none), 2 (right) per environment
+		actions = list(actions)
+		for conn, (first, last) in zip(self.connections, self.slices):
+			conn.send(('step', actions[first:last]))
+		for conn in self.connections:
+			conn.recv()
+		return self.obs, self.rewards, self.terminated, self.truncated
+
+	def close(self):
+		if self.closed:
+			return
+		self.closed = True
+		for conn in self.connections:
+			try:
+				conn.send(('close', None))
+			except (BrokenPipeError, OSError):
+				pass
+		for process in self.processes:
+			process.join(timeout=5)
+		del self.obs, self.final_obs, self.rewards, self.terminated, self.truncated
+		self.obs_memory.close()
+		self.obs_memory.unlink()
+		self.result_memory.close()
+		self.result_memory.unlink()
+
+	def __del__(self):
+		try:
+			self.close()
+		except Exception:
+			pass
@@ -0,0 +1,308 @@
+#physics fuzzer: plays the headless game rules with random and adversarial input sequences in worker processes
+#and checks invariants after every frame; a failing run is cut down to the shortest input trace that still
+#fails and written to hopit-fuzz-*.txt, and the exit status is non-zero so it can gate a release
+#usage: python fuzz.py [--frames 2000000] [--workers N] [--seed 0] [--max-frames 3000]
+#       python fuzz.py --replay hopit-fuzz-....txt
+import os
+import sys
+import math
+import time
+import random
+import multiprocessing
+from collections import deque
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')  # Once is enough, not once per worker
+from world import World, SCREEN_WIDTH, SCREEN_HEIGHT, MAX_FLOORS
+from powerups import POWERUPS, Pickup
+
+#one byte of input per frame
+KEY_LEFT = 1
+KEY_RIGHT = 2
+BUTTON_LEFT = 4  # On-screen buttons, which have their own tap/hold speeds
+BUTTON_RIGHT = 8
+JET = 16  # Drop a jetpack on the hero this frame
+
+BATCH = 20  # Runs per job handed to a worker
+MINIMIZE_REPLAYS = 3000  # Replays the minimizer may spend on one failure
+EPSILON = 1e-6
+
+
+def option(name, default):
+	flag = '--' + name
+	if flag in sys.argv[1:-1]:
+		return sys.argv[sys.argv.index(flag) + 1]
+	return default
+
+
+def apply_input(world, action):
+	hero = world.hero
+	hero.key_left = bool(action & KEY_LEFT)
+	hero.key_right = bool(action & KEY_RIGHT)
+	hero.move_left = bool(action & BUTTON_LEFT)
+	hero.move_right = bool(action & BUTTON_RIGHT)
+	if action & JET:
+		# Centred on the hero, so it is collected at whatever speed the hero has right now
+		world.pickup_group.add(Pickup('jet', hero.x + hero.width / 2, hero.y + hero.height / 2, world.pickup_size('jet')))
+
+
+#invariants, checked around every step; check() returns (name, detail) for the first one broken, or None
+class Invariants():
+	def __init__(self, world):
+		self.world = world
+		self.height = world.player_height
+		self.floors = []  # (floor, x, y, width) before the step
+
+	def before(self):
+		hero = self.world.hero
+		self.hero_x = hero.x
+		self.hero_bottom = hero.y + hero.height
+		self.floors = [(floor, floor.x, floor.y, floor.width) for floor in self.world.floor_group]
+
+	def check(self):
+		world = self.world
+		hero = world.hero
+		if not (math.isfinite(hero.x) and math.isfinite(hero.y) and math.isfinite(hero.vertical_speed)):
+			return 'hero-finite', f'hero at ({hero.x}, {hero.y}) speed {hero.vertical_speed}'
+
+		# A falling hero lands on a floor it meets; crossing a floor's top from above means it fell through
+		bottom = hero.y + hero.height
+		for floor, x, y, width in self.floors:
+			if (self.hero_x < x + width and x < self.hero_x + hero.width and self.hero_bottom <= y
+					and bottom > y + EPSILON):
+				return 'fell-through-floor', f'hero bottom {self.hero_bottom:.2f} -> {bottom:.2f}, floor top {y:.2f}'
+
+		if hero.x < -EPSILON or hero.x + hero.width > SCREEN_WIDTH + EPSILON:
+			return 'hero-on-screen', f'hero x {hero.x:.2f}'
+		for floor in world.floor_group:
+			if floor.x < -EPSILON or floor.x + floor.width > SCREEN_WIDTH + EPSILON:
+				return 'floor-on-screen', f'floor x {floor.x:.2f} width {floor.width}, moving {floor.is_moving}'
+
+		if world.player_height < self.height:
+			return 'height-monotonic', f'player_height {self.height} -> {world.player_height}'
+		self.height = world.player_height
+
+		# Nothing below the screen survives the frame, and spawning stays within its limits
+		bottom_edge = world.camera_y + SCREEN_HEIGHT
+		if len(world.floor_group) > MAX_FLOORS:
+			return 'floor-leak', f'{len(world.floor_group)} floors'
+		for group, name in ((world.floor_group, 'floor-leak'), (world.pickup_group, 'pickup-leak')):
+			for sprite in group:
+				if sprite.y > bottom_edge:
+					return name, f'sprite at y {sprite.y:.2f} below the screen bottom {bottom_edge:.2f}'
+		for kind, powerup in POWERUPS.items():
+			count = sum(1 for pickup in world.pickup_group if pickup.kind == kind)
+			if count > powerup.max_active:
+				return 'pickup-leak', f'{count} {kind} pickups, at most {powerup.max_active}'
+		return None
+
+
+#input strategies: each picks the next frame's input from the world and its own rng
+def random_inputs(world, rng, state):
+	# Mostly keeps the last input, like a player holding keys
+	if rng.random() < 0.2:
+		state['action'] = rng.choice((0, KEY_LEFT, KEY_RIGHT, BUTTON_LEFT, BUTTON_RIGHT, KEY_LEFT | KEY_RIGHT,
+									  KEY_LEFT | BUTTON_RIGHT, BUTTON_LEFT | BUTTON_RIGHT))
+	return state.get('action', 0)
+
+def rapid_toggles(world, rng, state):
+	# Left/right swapped every few frames, on keys or buttons
+	if 'period' not in state:
+		state['period'] = rng.randint(1, 4)
+		state['pair'] = rng.choice(((KEY_LEFT, KEY_RIGHT), (BUTTON_LEFT, BUTTON_RIGHT), (KEY_LEFT, BUTTON_RIGHT)))
+		state['frame'] = 0
+	state['frame'] += 1
+	return state['pair'][(state['frame'] // state['period']) % 2]
+
+def hold_into_walls(world, rng, state):
+	# Long holds in one direction, pinning the hero against a screen edge
+	if state.get('left', 0) <= 0:
+		state['left'] = rng.randint(60, 240)
+		state['action'] = rng.choice((KEY_LEFT, KEY_RIGHT, BUTTON_LEFT, BUTTON_RIGHT))
+	state['left'] -= 1
+	return state['action']
+
+def climb(world, rng, state):
+	# Steer towards the next floor, to get high enough for moving floors and scheduled jetpacks
+	hero = world.hero
+	centre = hero.x + hero.width / 2
+	bottom = hero.y + hero.height
+	target = None
+	for floor in world.floor_group:
+		if (floor.y >= bottom) if hero.vertical_speed > 0 else (floor.y < bottom - 60):
+			if target is None or (floor.y < target.y if hero.vertical_speed > 0 else floor.y > target.y):
+				target = floor
+	if target is None or rng.random() < 0.05:
+		return rng.choice((0, KEY_LEFT, KEY_RIGHT))
+	target_x = target.x + target.width / 2
+	if target_x < centre - 6:
+		return KEY_LEFT
+	if target_x > centre + 6:
+		return KEY_RIGHT
+	return 0
+
+def jet_at_peak(world, rng, state):
+	# Climb, and drop jetpacks on the hero when it is moving fastest: falling hard or just bounced
+	action = climb(world, rng, state)
+	speed = world.hero.vertical_speed
+	state['cooldown'] = state.get('cooldown', 0) - 1
+	if state['cooldown'] <= 0 and (speed > 12 or speed <= -14.5):
+		state['cooldown'] = rng.randint(10, 90)
+		action |= JET
+	return action
+
+def chaos(world, rng, state):
+	# Any input, any frame, with the odd jetpack
+	action = rng.randrange(16)
+	if rng.random() < 0.01:
+		action |= JET
+	return action
+
+STRATEGIES = (random_inputs, rapid_toggles, hold_into_walls, climb, jet_at_peak, chaos)
+
+
+def play(seed, next_input, max_frames):
+	# Run one game; returns the inputs used and (name, frame, detail) for a broken invariant, or None
+	world = World(seed)
+	invariants = Invariants(world)
+	inputs = bytearray()
+	for frame in range(max_frames):
+		action = next_input(world, frame)
+		inputs.append(action)
+		apply_input(world, action)
+		invariants.before()
+		world.step()
+		failure = invariants.check()
+		if failure is not None:
+			return inputs, (failure[0], frame, failure[1])
+		if world.end_state:
+			break
+	return inputs, None
+
+def replay(seed, inputs, frames=None):
+	# Nothing is pressed after the trace ends, up to frames
+	count = len(inputs)
+	return play(seed, lambda world, frame: inputs[frame] if frame < count else 0, frames or count)[1]
+
+def fuzz_run(seed, max_frames):
+	rng = random.Random(seed * 7919 + 1)
+	strategy = STRATEGIES[seed % len(STRATEGIES)]
+	state = {}
+	return strategy.__name__, play(seed, lambda world, frame: strategy(world, rng, state), max_frames)
+
+def fuzz_batch(job):
+	# Worker: runs BATCH games; returns frames played and the failures, with their full input traces
+	first_seed, max_frames = job
+	frames = 0
+	failures = []
+	for seed in range(first_seed, first_seed + BATCH):
+		strategy, (inputs, failure) = fuzz_run(seed, max_frames)
+		frames += len(inputs)
+		if failure is not None:
+			failures.append((seed, strategy, bytes(inputs), failure))
+	return frames, failures
+
+
+def minimize(seed, inputs, name):
+	# Shrink the trace while the same invariant still breaks: drop ever smaller chunks of frames, then clear
+	# inputs to "nothing pressed"; a candidate is kept when it fails sooner, or as soon with fewer inputs
+	replays = 0
+	def cost(trace):
+		return len(trace), len(trace) - trace.count(0)
+	def still_fails(candidate):
+		nonlocal replays
+		replays += 1
+		failure = replay(seed, candidate, len(inputs))
+		if failure is None or failure[0] != name:
+			return None
+		shorter = (candidate + bytes(len(inputs)))[:failure[1] + 1]
+		return shorter if cost(shorter) < cost(inputs) else None
+
+	inputs = bytes(inputs)
+	chunk = max(1, len(inputs) // 2)
+	while chunk >= 1 and replays < MINIMIZE_REPLAYS:
+		start = 0
+		while start < len(inputs) and replays < MINIMIZE_REPLAYS:
+			shorter = still_fails(inputs[:start] + inputs[start + chunk:])
+			if shorter is not None:
+				inputs = shorter
+			else:
+				start += chunk
+		chunk //= 2
+	for frame in range(len(inputs)):
+		if replays >= MINIMIZE_REPLAYS:
+			break
+		if frame < len(inputs) and inputs[frame]:
+			simpler = still_fails(inputs[:frame] + b'\0' + inputs[frame + 1:])
+			if simpler is not None:
+				inputs = simpler
+	return inputs
+
+def write_failure(seed, strategy, inputs, failure, output_dir='.'):
+	name, frame, detail = failure
+	path = os.path.join(output_dir, f'hopit-fuzz-{name}-{seed}.txt')
+	try:
+		with open(path, 'w') as file:
+			file.write(f'invariant {name}\nframe {frame}\ndetail {detail}\nstrategy {strategy}\n')
+			file.write(f'seed {seed}\ninputs {inputs.hex()}\n')
+		print(f"  written to {path}, replay with: python fuzz.py --replay {path}")
+	except Exception as e:
+		print(f"  could not write {path}: {e}")
+
+def read_failure(path):
+	values = {}
+	with open(path) as file:
+		for line in file:
+			key, _, value = line.rstrip('\n').partition(' ')
+			values[key] = value
+	return int(values['seed']), bytes.fromhex(values['inputs'])
+
+
+def main():
+	if '--replay' in sys.argv:
+		seed, inputs = read_failure(option('replay', ''))
+		failure = replay(seed, inputs)
+		if failure is None:
+			print(f"Seed {seed}, {len(inputs)} frames: no invariant broken")
+			return 0
+		print(f"Seed {seed}: {failure[0]} at frame {failure[1]}: {failure[2]}")
+		return 1
+
+	total = int(option('frames', '2000000'))
+	workers = int(option('workers', str(os.cpu_count() or 1)))
+	seed = int(option('seed', '0'))
+	max_frames = int(option('max-frames', '3000'))
+	print(f"Fuzzing {total} frames on {workers} workers, {len(STRATEGIES)} input strategies")
+
+	start = time.perf_counter()
+	frames = 0
+	runs = 0
+	found = {}  # Invariant -> first failure
+	context = multiprocessing.get_context('spawn')
+	with context.Pool(workers) as pool:
+		# A couple of jobs queued per worker keeps them all busy without queueing more than is needed
+		pending = deque()
+		next_seed = seed
+		while frames < total:
+			while len(pending) < workers * 2:
+				pending.append(pool.apply_async(fuzz_batch, ((next_seed, max_frames),)))
+				next_seed += BATCH
+			batch_frames, failures = pending.popleft().get()
+			frames += batch_frames
+			runs += BATCH
+			for failure in failures:
+				found.setdefault(failure[3][0], failure)
+		pool.terminate()
+	elapsed = time.perf_counter() - start
+	print(f"{frames} frames in {runs} runs, {elapsed:.1f} s ({frames / elapsed:,.0f} frames/s)")
+
+	for name, (failed_seed, strategy, inputs, failure) in sorted(found.items()):
+		shortest = minimize(failed_seed, inputs, name)
+		failure = replay(failed_seed, shortest)
+		print(f"FAIL {name}: seed {failed_seed} ({strategy}), {len(inputs)} frames minimized to {len(shortest)}: {failure[2]}")
+		write_failure(failed_seed, strategy, shortest, failure)
+	if not found:
+		print("All invariants held")
+	return 1 if found else 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,96 @@
+#live performance overlay (F3): fps, frame-time graph, phase timings, entity counts, cache hit rates
+import pygame
+from surfcache import SurfaceCache, caches
+from telemetry import PHASES
+
+HUD_WIDTH = 190
+HUD_MAX_HEIGHT = 400
+GRAPH_HEIGHT = 36
+GRAPH_MAX_MS = 33.3  # Frame time at the top of the graph
+BUDGET_MS = 1000 / 60
+REFRESH_FRAMES = 15  # Rebuild the text lines four times a second at 60 fps
+LINE_COLOR = (235, 235, 235)
+GRAPH_COLOR = (90, 220, 120)
+GRAPH_OVER_COLOR = (240, 80, 60)
+BUDGET_COLOR = (200, 200, 60)
+
+
+class PerfHud():
+	def __init__(self, x, y, font, clock, telemetry, groups):
+		self.x = x
+		self.y = y
+		self.font = font
+		self.clock = clock
+		self.telemetry = telemetry
+		self.groups = groups  # Name -> sprite group whose size is shown
+		self.status = []  # (label, callable) pairs for extra state such as the quality tier
+		self.visible = False
+		self.line_height = font.get_linesize()
+		self.text_cache = SurfaceCache('hud text', 128)
+		self.lines = []
+		self.refresh_timer = 0
+
+		# Panel background and graph are built once; the graph scrolls one column per frame
+		self.background = pygame.Surface((HUD_WIDTH, HUD_MAX_HEIGHT))
+		self.background.fill((0, 0, 0))
+		self.background.set_alpha(170)
+		self.graph = pygame.Surface((HUD_WIDTH - 8, GRAPH_HEIGHT))
+		self.graph.fill((0, 0, 0))
+		self.budget_y = GRAPH_HEIGHT - int(GRAPH_HEIGHT * BUDGET_MS / GRAPH_MAX_MS)
+
+	def add_status(self, label, source):
+		self.status.append((label, source))
+
+	def toggle(self):
+		self.visible = not self.visible
+		# Per-phase timings come from telemetry, so record while the overlay is up
+		self.telemetry.set_enabled('hud', self.visible)
+		if self.visible:
+			self.refresh_timer = 0
+
+	def render_line(self, text):
+		return self.text_cache.get(text, self.font.render, text, True, LINE_COLOR)
+
+	def update(self):
+		if not self.visible:
+			return
+		# Push this frame's work time (excluding the tick wait) onto the graph
+		frame_ms = self.clock.get_rawtime()
+		self.graph.scroll(-1, 0)
+		column = self.graph.get_width() - 1
+		self.graph.fill((0, 0, 0), (column, 0, 1, GRAPH_HEIGHT))
+		bar = min(GRAPH_HEIGHT, int(GRAPH_HEIGHT * frame_ms / GRAPH_MAX_MS))
+		color = GRAPH_OVER_COLOR if frame_ms > BUDGET_MS else GRAPH_COLOR
+		self.graph.fill(color, (column, GRAPH_HEIGHT - bar, 1, bar))
+		self.graph.set_at((column, self.budget_y), BUDGET_COLOR)
+
+		self.refresh_timer -= 1
+		if self.refresh_timer > 0:
+			return
+		self.refresh_timer = REFRESH_FRAMES
+
+		# Each line is a label and an optional right-aligned value
+		rows = [(f'FPS {self.clock.get_fps():.1f}', f'work {frame_ms} ms')]
+		for name, ms in zip(PHASES, self.telemetry.recent_phase_ms(REFRESH_FRAMES)):
+			rows.append((name, f'{ms:.2f}'))
+		for label, source in self.status:
+			rows.append((label, str(source())))
+		for name, group in self.groups.items():
+			rows.append((name, str(len(group))))
+		for cache in caches:
+			rows.append((f'{cache.name} hits', f'{cache.hit_rate() * 100:.0f}% of {cache.hits + cache.misses}'))
+		self.lines = [(self.render_line(label), self.render_line(value)) for label, value in rows]
+
+	def draw(self, gfx):
+		if not self.visible:
+			return
+		gfx.mark_dirty(self.graph)  # The graph is drawn into every frame
+		height = min(HUD_MAX_HEIGHT, GRAPH_HEIGHT + 8 + len(self.lines) * self.line_height)
+		gfx.blit(self.background, (self.x, self.y), (0, 0, HUD_WIDTH, height))
+		gfx.blit(self.graph, (self.x + 4, self.y + 4))
+		line_y = self.y + GRAPH_HEIGHT + 6
+		value_right = self.x + HUD_WIDTH - 4
+		for label, value in self.lines:
+			gfx.blit(label, (self.x + 4, line_y))
+			gfx.blit(value, (value_right - value.get_width(), line_y))
+			line_y += self.line_height
@@ -0,0 +1,65 @@
+#idle mode: once the current screen has stopped animating, the loop stops redrawing it at the full frame rate
+#screens that still move slowly (the home screen's scrolling background) drop to a low frame rate, fully static
+#ones sleep in pygame.event.wait until input arrives; any input brings back the full rate on the next frame
+import sys
+import time
+import pygame
+
+IDLE_AFTER = 0.5  # Seconds without input or animation before slowing down
+STATIC_TIMEOUT = 1000  # Longest sleep on a static screen (ms), so the loop still comes round now and then
+
+
+class IdleMode():
+	def __init__(self, frame_time, enabled=True):
+		self.frame_time = frame_time  # Seconds per frame at the full rate
+		# In the browser build the page's event loop must keep running, so the game never blocks there
+		self.enabled = enabled and sys.platform != 'emscripten'
+		self.quiet = 0.0  # Seconds since the last input or animation
+		self.woken_by = None  # Event that ended the last wait; it is handed back with the next batch
+		self.waited_ms = 0.0  # Time slept before this frame, so it isn't counted as frame work
+		self.rate = None  # Frame rate while idle: None at full rate, 0 asleep until input
+
+	def wait(self, fps):
+		# Call at the top of the frame with the screen's idle frame rate (0 when static, None to never idle)
+		self.waited_ms = 0.0
+		if not self.enabled or fps is None or self.quiet < IDLE_AFTER:
+			self.rate = None
+			return
+		self.rate = fps
+		if pygame.event.peek():
+			return
+		start = time.perf_counter()
+		event = pygame.event.wait(int(1000 / fps) if fps else STATIC_TIMEOUT)
+		if event.type != pygame.NOEVENT:
+			self.woken_by = event
+		self.waited_ms = (time.perf_counter() - start) * 1000
+
+	def frame_dt(self, dt):
+		# dt for the frame after a wait; input that cut a sleep short starts its animations from zero,
+		# rather than as if they had been running since the sleep began
+		if self.woken_by is not None:
+			return min(dt, self.frame_time)
+		return dt
+
+	def events(self):
+		# The frame's events, starting with the one that ended the wait
+		events = pygame.event.get()
+		if self.woken_by is not None:
+			events.insert(0, self.woken_by)
+			self.woken_by = None
+		return events
+
+	def update(self, dt, events, animating):
+		# Call once the frame's events are handled; animating is True while anything on screen moves
+		if events or animating:
+			self.quiet = 0.0
+		else:
+			self.quiet += dt
+
+	def status(self):
+		# One line for the performance overlay
+		if not self.enabled:
+			return 'off'
+		if self.rate is None:
+			return 'full rate'
+		return f'{self.rate} fps' if self.rate else 'asleep until input'
@@ -0,0 +1,94 @@
+#input latency (F6): time from an input event to the present() of the first frame drawn after reading it
+#pygame events carry no timestamp here, so an event is only known to have arrived between two event reads;
+#both ends are kept and the report gives the range (with SDL timestamps the two are the same)
+import os
+import time
+import pygame
+from array import array
+
+INPUT_EVENTS = (pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP,
+				pygame.FINGERDOWN, pygame.FINGERUP, pygame.FINGERMOTION)
+
+
+class LatencyMeter():
+	def __init__(self, output_dir='.'):
+		self.output_dir = output_dir
+		self.active = False
+		self.last_read = time.perf_counter()
+		self.pending = []  # (earliest, latest) arrival of each event read this frame
+
+	def start(self):
+		if self.active:
+			return
+		self.active = True
+		self.shortest = array('d')  # Milliseconds, if the event arrived just before it was read
+		self.longest = array('d')  # If it arrived just after the previous read
+		self.pending.clear()
+		print("Latency measurement started")
+
+	def events_read(self, events):
+		# Call with each batch from pygame.event.get()
+		now = time.perf_counter()
+		if self.active:
+			for event in events:
+				if event.type in INPUT_EVENTS:
+					timestamp = getattr(event, 'timestamp', None)
+					if timestamp is not None:
+						sent = now - (pygame.time.get_ticks() - timestamp) / 1000
+						self.pending.append((sent, sent))
+					else:
+						self.pending.append((self.last_read, now))
+		self.last_read = now
+
+	def presented(self):
+		# Call right after the frame is presented
+		if self.pending:
+			now = time.perf_counter()
+			for earliest, latest in self.pending:
+				self.shortest.append((now - latest) * 1000)
+				self.longest.append((now - earliest) * 1000)
+			self.pending.clear()
+
+	def status(self):
+		# One line for the performance overlay
+		if not self.active:
+			return 'off'
+		if not self.shortest:
+			return 'no input yet'
+		return f'{median(self.shortest[-30:]):.1f}-{median(self.longest[-30:]):.1f} ms'
+
+	def report(self):
+		count = len(self.shortest)
+		if not count:
+			return ["Input latency: no input events measured"]
+		shortest = sorted(self.shortest)
+		longest = sorted(self.longest)
+		lines = [f"Input latency over {count} events, event to present (ms):"]
+		for name, index in (('median', count // 2), ('95th percentile', count * 95 // 100), ('max', count - 1)):
+			lines.append(f"  {name:<16}{shortest[index]:7.1f} - {longest[index]:.1f}")
+		return lines
+
+	def stop(self):
+		if not self.active:
+			return
+		self.active = False
+		lines = self.report()
+		path = os.path.join(self.output_dir, 'hopit-latency-' + time.strftime('%Y%m%d-%H%M%S') + '.txt')
+		try:
+			with open(path, 'w') as file:
+				file.write('\n'.join(lines) + '\n')
+			print(f"Latency report written to {path}")
+		except Exception as e:
+			print(f"Could not write latency report: {e}")
+		print('\n'.join(lines))
+
+	def toggle(self):
+		if self.active:
+			self.stop()
+		else:
+			self.start()
+
+
+def median(values):
+	values = sorted(values)
+	return values[len(values) // 2]
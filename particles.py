@@ -0,0 +1,134 @@
+#particle effects (jetpack exhaust, landing dust) stored in numpy arrays and drawn in one batched call
+#units are pixels and frames, like the world's physics; positions are world coordinates, drawn through the camera
+import pygame
+from world import SCREEN_HEIGHT
+try:
+	import numpy as np
+except ImportError:
+	np = None  # Effects are skipped without numpy
+
+STAGES = 4  # Sprites per effect, from fresh to nearly faded out
+
+#effect -> (color, largest radius, gravity per frame)
+EFFECTS = (
+	('exhaust', (255, 170, 60), 5, 0.05),
+	('dust', (235, 225, 200), 4, 0.12),
+)
+EXHAUST = 0
+DUST = 1
+
+
+def make_sprites(convert):
+	# One small sprite per effect and stage: shrinking, fading circles
+	sprites = []
+	for name, color, radius, gravity in EFFECTS:
+		for stage in range(STAGES):
+			size = max(1, radius - stage)
+			alpha = 255 - stage * 50
+			sprite = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+			pygame.draw.circle(sprite, color + (alpha,), (size, size), size)
+			sprites.append(sprite.convert_alpha() if convert else sprite)
+	return sprites
+
+
+class ParticleSystem():
+	def __init__(self, capacity=8192):
+		self.enabled = np is not None
+		self.capacity = capacity if self.enabled else 0
+		self.count = 0
+		if not self.enabled:
+			print("numpy not found. Game will run without particle effects.")
+			return
+		self.x = np.zeros(capacity, np.float32)
+		self.y = np.zeros(capacity, np.float32)
+		self.vx = np.zeros(capacity, np.float32)
+		self.vy = np.zeros(capacity, np.float32)
+		self.life = np.zeros(capacity, np.float32)  # Frames left
+		self.max_life = np.ones(capacity, np.float32)
+		self.kind = np.zeros(capacity, np.intp)
+		self.gravity = np.array([effect[3] for effect in EFFECTS], np.float32)
+		self.sprites = make_sprites(pygame.display.get_surface() is not None)
+		# Offset from particle centre to sprite corner, per sprite
+		self.half = np.array([sprite.get_width() / 2 for sprite in self.sprites], np.float32)
+		self.rng = np.random.default_rng()
+		# Scratch space, so updating and drawing allocate no arrays
+		self.scratch = np.zeros(capacity, np.float32)
+		self.scratch_index = np.zeros(capacity, np.intp)
+		self.alive = np.zeros(capacity, np.bool_)
+		self.onscreen = np.zeros(capacity, np.bool_)
+		self.index = np.zeros(capacity, np.intp)
+		self.left = np.zeros(capacity, np.int32)
+		self.top = np.zeros(capacity, np.int32)
+
+	def __len__(self):
+		return self.count
+
+	def emit(self, kind, n, x, y, speed, angle, spread, life):
+		# n particles from (x, y), heading angle +- spread (radians, 0 is right, pi/2 is down)
+		n = min(int(n), self.capacity - self.count)  # Full pool: the rest are not emitted
+		if n <= 0:
+			return
+		start = self.count
+		end = start + n
+		rng = self.rng
+		angles = angle + rng.uniform(-spread, spread, n)
+		speeds = speed * rng.uniform(0.5, 1.0, n)
+		self.x[start:end] = x
+		self.y[start:end] = y
+		self.vx[start:end] = np.cos(angles) * speeds
+		self.vy[start:end] = np.sin(angles) * speeds
+		self.life[start:end] = life * rng.uniform(0.6, 1.0, n)
+		self.max_life[start:end] = self.life[start:end]
+		self.kind[start:end] = kind
+		self.count = end
+
+	def update(self, camera_y):
+		n = self.count
+		if n == 0:
+			return
+		scratch = self.scratch[:n]
+		y = self.y[:n]
+		np.take(self.gravity, self.kind[:n], out=scratch)
+		self.vy[:n] += scratch
+		self.x[:n] += self.vx[:n]
+		y += self.vy[:n]
+		self.life[:n] -= 1
+		# Keep live particles packed at the front of the arrays
+		alive = self.alive[:n]
+		np.greater(self.life[:n], 0, out=alive)
+		np.less(y, camera_y + SCREEN_HEIGHT + 10, out=self.onscreen[:n])
+		alive &= self.onscreen[:n]
+		live = int(np.count_nonzero(alive))
+		if live < n:
+			for array in (self.x, self.y, self.vx, self.vy, self.life, self.max_life):
+				np.compress(alive, array[:n], out=self.scratch[:live])
+				array[:live] = self.scratch[:live]
+			np.compress(alive, self.kind[:n], out=self.scratch_index[:live])
+			self.kind[:live] = self.scratch_index[:live]
+			self.count = live
+
+	def clear(self):
+		self.count = 0
+
+	def draw(self, gfx, camera_y):
+		n = self.count
+		if n == 0:
+			return
+		# Sprite per particle from its effect and how far through its life it is
+		scratch = self.scratch[:n]
+		index = self.index[:n]
+		np.divide(self.life[:n], self.max_life[:n], out=scratch)
+		np.subtract(1, scratch, out=scratch)
+		scratch *= STAGES
+		index[:] = scratch
+		np.minimum(index, STAGES - 1, out=index)
+		np.multiply(self.kind[:n], STAGES, out=self.scratch_index[:n])
+		index += self.scratch_index[:n]
+		# Top-left corner of each sprite on screen
+		np.take(self.half, index, out=scratch)
+		self.left[:n] = self.x[:n] - scratch
+		scratch += camera_y
+		self.top[:n] = self.y[:n] - scratch
+		# Iterating memoryviews hands out one small int at a time, so no per-particle lists are built
+		gfx.blits(zip(map(self.sprites.__getitem__, memoryview(index)),
+					  zip(memoryview(self.left[:n]), memoryview(self.top[:n]))))
@@ -0,0 +1,40 @@
+#power-up registry: each kind says how big its pickup is, at which heights it appears and what collecting it does
+#the world schedules spawns by height from this table, so a new kind needs no new checks in the game loop
+import pygame
+
+JET_SIZE = (30, 30)  # Size of the jet pickup when no sprite is given
+
+
+class PowerUp():
+	def __init__(self, name, size, first, interval, collect, max_active=1):
+		self.name = name
+		self.size = size
+		self.first = first  # Height of the first spawn
+		self.interval = interval  # Height between spawns after that
+		self.collect = collect  # collect(world), called when the hero touches the pickup
+		self.max_active = max_active  # A spawn is skipped while this many are still in the world
+
+
+#pickup sprite in world coordinates; kind is the power-up's registry name
+class Pickup(pygame.sprite.Sprite):
+	def __init__(self, kind, x, y, size):
+		pygame.sprite.Sprite.__init__(self)
+		self.kind = kind
+		self.width, self.height = size
+		self.x = x - self.width // 2  # Top-left corner, centred on (x, y)
+		self.y = y - self.height // 2
+
+
+def collect_jet(world):
+	hero = world.hero
+	hero.has_jet = True
+	hero.vertical_speed = -10  # Reduced boost for smaller jump
+
+
+POWERUPS = {}
+
+def register_powerup(powerup):
+	POWERUPS[powerup.name] = powerup
+
+#jetpack every 600 points
+register_powerup(PowerUp('jet', JET_SIZE, 600, 600, collect_jet))
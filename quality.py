@@ -0,0 +1,85 @@
+#adaptive quality governor: trades visual detail for frame time on slow devices
+QUALITY_TIERS = (
+	{'name': 'High', 'particles': 1.0, 'text_outline': True, 'clouds': True, 'opaque_layers': False, 'home_anim_interval': 1},
+	{'name': 'Medium', 'particles': 0.5, 'text_outline': False, 'clouds': True, 'opaque_layers': False, 'home_anim_interval': 1},
+	{'name': 'Low', 'particles': 0.25, 'text_outline': False, 'clouds': False, 'opaque_layers': False, 'home_anim_interval': 1},
+	{'name': 'Minimal', 'particles': 0, 'text_outline': False, 'clouds': False, 'opaque_layers': True, 'home_anim_interval': 3},
+)
+
+SMOOTHING = 0.1  # Weight of the newest frame in the smoothed work time
+DEGRADE_FRACTION = 0.85  # Drop a tier when smoothed work time stays above this share of the budget...
+DEGRADE_FRAMES = 30  # ...for this many frames
+RESTORE_FRACTION = 0.45  # Raise a tier when there is this much headroom...
+RESTORE_FRAMES = 240  # ...for this many frames (slower than degrading so tiers don't flap)
+WARMUP_FRAMES = 60  # Ignore startup frames (asset decode, first blits)
+
+
+class QualityGovernor():
+	def __init__(self, mode='auto', budget_ms=1000 / 60):
+		self.budget_ms = budget_ms
+		self.auto = True
+		self.tier = 0
+		self.smoothed_ms = 0.0
+		self.slow_frames = 0
+		self.fast_frames = 0
+		self.warmup = WARMUP_FRAMES
+		self.set_mode(mode)
+
+	def set_mode(self, mode):
+		# mode is 'auto' or a tier name/index to pin the quality
+		names = [tier['name'].lower() for tier in QUALITY_TIERS]
+		mode = str(mode).lower()
+		if mode in names:
+			self.auto = False
+			self.set_tier(names.index(mode))
+		elif mode.isdigit() and int(mode) < len(QUALITY_TIERS):
+			self.auto = False
+			self.set_tier(int(mode))
+		else:
+			self.auto = True
+			self.set_tier(0)
+
+	def set_tier(self, tier):
+		self.tier = tier
+		self.slow_frames = 0
+		self.fast_frames = 0
+		# Copy the tier's settings onto the governor so the game reads plain attributes
+		for key, value in QUALITY_TIERS[tier].items():
+			setattr(self, key, value)
+
+	def cycle(self):
+		# Auto -> High -> Medium -> Low -> Minimal -> Auto
+		if self.auto:
+			self.auto = False
+			self.set_tier(0)
+		elif self.tier + 1 < len(QUALITY_TIERS):
+			self.set_tier(self.tier + 1)
+		else:
+			self.auto = True
+			self.smoothed_ms = 0.0
+			self.set_tier(0)
+
+	def update(self, work_ms):
+		# Feed the time spent on the last frame, excluding the wait in clock.tick
+		if not self.auto:
+			return
+		if self.warmup > 0:
+			self.warmup -= 1
+			return
+		self.smoothed_ms += (work_ms - self.smoothed_ms) * SMOOTHING
+		if self.smoothed_ms > self.budget_ms * DEGRADE_FRACTION:
+			self.slow_frames += 1
+			self.fast_frames = 0
+			if self.slow_frames >= DEGRADE_FRAMES and self.tier + 1 < len(QUALITY_TIERS):
+				self.set_tier(self.tier + 1)
+		elif self.smoothed_ms < self.budget_ms * RESTORE_FRACTION:
+			self.fast_frames += 1
+			self.slow_frames = 0
+			if self.fast_frames >= RESTORE_FRAMES and self.tier > 0:
+				self.set_tier(self.tier - 1)
+		else:
+			self.slow_frames = 0
+			self.fast_frames = 0
+
+	def describe(self):
+		return ('Auto: ' if self.auto else '') + self.name
@@ -0,0 +1,253 @@
+#render backends: software blitting onto the display surface (default), or SDL2 Renderer/Texture drawing
+import weakref
+import pygame
+from surfcache import SurfaceCache, caches
+
+
+class SurfaceRenderer():
+	def __init__(self, size, caption):
+		self.size = size
+		self.surface = pygame.display.set_mode(size)
+		pygame.display.set_caption(caption)
+		self.transformed = SurfaceCache('flip/scale', 256)
+
+	def blit(self, image, pos, area=None):
+		self.surface.blit(image, pos, area)
+
+	def blits(self, pairs):
+		# Many (image, pos) or (image, pos, area) items in one call
+		self.surface.blits(pairs, doreturn=False)
+
+	def blit_transformed(self, image, pos, flip_x=False, size=None):
+		self.surface.blit(self.prepare(image, flip_x, size), pos)
+
+	def prepare(self, image, flip_x=False, size=None):
+		# Flipped and scaled variants are built once and reused; the result can go straight to blits()
+		if size is not None and size == image.get_size():
+			size = None
+		if flip_x or size is not None:
+			image = self.transformed.get((image, flip_x, size), transform, image, flip_x, size)
+		return image
+
+	def fill(self, color, rect=None):
+		self.surface.fill(color, rect)
+
+	def mark_dirty(self, image):
+		# Surfaces are drawn directly, nothing to refresh
+		pass
+
+	def release(self, image):
+		# Nothing is held besides the surface itself
+		pass
+
+	def finger_pos(self, event):
+		# Touch events are normalised to 0-1 over the window
+		return (event.x * self.size[0], event.y * self.size[1])
+
+	def start_readback(self):
+		# The display surface is already the frame at its logical size
+		pass
+
+	def stop_readback(self):
+		pass
+
+	def read_pixels(self, target):
+		# Copy the finished frame into target (same size), e.g. for capture
+		target.blit(self.surface, (0, 0))
+
+	def present(self):
+		pygame.display.update()
+
+	def close(self):
+		pass
+
+
+def transform(image, flip_x, size):
+	if size is not None:
+		image = pygame.transform.scale(image, size)
+	if flip_x:
+		image = pygame.transform.flip(image, True, False)
+	return image
+
+
+#a texture drawn flipped or at another size, standing in for a transformed surface in blits()
+class TransformedTexture():
+	def __init__(self, image, flip_x, size):
+		self.image = image  # The texture itself is looked up at draw time, in case the image was marked dirty
+		self.flip_x = flip_x
+		self.size = size
+
+	def get_size(self):
+		return self.size
+
+
+class TextureCache():
+	# One texture per source surface, dropped automatically when the surface is freed
+	# get() returns (texture, source rect); a subsurface such as an atlas region shares its parent's texture
+	def __init__(self, renderer, texture_class):
+		self.name = 'textures'
+		self.renderer = renderer
+		self.texture_class = texture_class
+		self.items = weakref.WeakKeyDictionary()
+		self.pages = weakref.WeakSet()  # Surfaces with regions drawn from their texture
+		self.hits = 0
+		self.misses = 0
+		caches.append(self)
+
+	def get(self, surface):
+		entry = self.items.get(surface)
+		if entry is not None:
+			self.hits += 1
+			return entry
+		self.misses += 1
+		parent = surface.get_abs_parent()
+		if parent is surface:
+			texture = self.texture_class.from_surface(self.renderer, surface)
+			entry = (texture, (0, 0, texture.width, texture.height))
+		else:
+			self.pages.add(parent)
+			x, y = surface.get_abs_offset()
+			entry = (self.get(parent)[0], (x, y, surface.get_width(), surface.get_height()))
+		self.items[surface] = entry
+		return entry
+
+	def discard(self, surface):
+		# Forget the texture for surface, and every region drawn from it
+		entry = self.items.pop(surface, None)
+		if entry is not None and surface in self.pages:
+			for region in [region for region, other in self.items.items() if other[0] is entry[0]]:
+				del self.items[region]
+
+	def hit_rate(self):
+		lookups = self.hits + self.misses
+		return self.hits / lookups if lookups else 0.0
+
+	def clear(self):
+		self.items.clear()
+
+
+class TextureRenderer():
+	def __init__(self, size, caption, scale=1, software=False):
+		from pygame._sdl2.video import Window, Renderer, Texture
+		self.size = size
+		self.surface = None  # There is no display surface to draw on
+		self.window = Window(caption, (int(size[0] * scale), int(size[1] * scale)), resizable=True)
+		# accelerated=0 asks SDL for its software renderer, which also works on machines without a GPU
+		self.renderer = Renderer(self.window, accelerated=0 if software else -1)
+		# The game always draws at 400x600; SDL scales to the window when presenting
+		self.renderer.logical_size = size
+		self.textures = TextureCache(self.renderer, Texture)
+		self.transformed = SurfaceCache('flip/scale', 256)
+		self.Texture = Texture
+		self.frame = None  # Texture the frame is drawn into while it is being read back
+
+	def blit(self, image, pos, area=None):
+		if type(image) is TransformedTexture:
+			# A prepare() result, as on the surface backend where it is a plain surface
+			self.blit_transformed(image.image, pos, image.flip_x, image.size)
+			return
+		texture, source = self.textures.get(image)
+		if area is None:
+			texture.draw(srcrect=source, dstrect=(pos[0], pos[1], source[2], source[3]))
+		else:
+			# area is relative to the image, which may be a region of a larger texture
+			area = pygame.Rect(area).move(source[0], source[1]).clip(source)
+			texture.draw(srcrect=area, dstrect=(pos[0], pos[1], area.width, area.height))
+
+	def blits(self, items):
+		# Still one draw call per item; SDL batches them itself, and atlas regions all share one texture
+		get = self.textures.get
+		for item in items:
+			image = item[0]
+			pos = item[1]
+			if type(image) is TransformedTexture:
+				size = image.size
+				texture, source = get(image.image)
+				texture.draw(srcrect=source, dstrect=(pos[0], pos[1], size[0], size[1]), flip_x=image.flip_x)
+			elif len(item) > 2:
+				self.blit(image, pos, item[2])
+			else:
+				texture, source = get(image)
+				texture.draw(srcrect=source, dstrect=(pos[0], pos[1], source[2], source[3]))
+
+	def blit_transformed(self, image, pos, flip_x=False, size=None):
+		# Flip and scale happen on the renderer at draw time
+		texture, source = self.textures.get(image)
+		if size is None:
+			size = (source[2], source[3])
+		texture.draw(srcrect=source, dstrect=(pos[0], pos[1], size[0], size[1]), flip_x=flip_x)
+
+	def prepare(self, image, flip_x=False, size=None):
+		# No pixels are transformed, the texture is just drawn flipped or stretched
+		if not flip_x and size is None:
+			return image
+		if size is None:
+			size = image.get_size()
+		return self.transformed.get((image, flip_x, size), TransformedTexture, image, flip_x, size)
+
+	def fill(self, color, rect=None):
+		self.renderer.draw_color = pygame.Color(color)
+		if rect is None:
+			self.renderer.clear()
+		else:
+			self.renderer.fill_rect(rect)
+
+	def mark_dirty(self, image):
+		# The surface was drawn into since it was uploaded, upload it again on next use
+		self.textures.discard(image)
+
+	def release(self, image):
+		# Free the texture until image is drawn again, e.g. when leaving the only screen that shows it
+		self.textures.discard(image)
+
+	def finger_pos(self, event):
+		return (event.x * self.size[0], event.y * self.size[1])
+
+	def start_readback(self):
+		# The window holds the frame scaled to its own size, so while frames are read back they are drawn
+		# into a texture at the logical size instead, and that texture is scaled to the window when presenting
+		if self.frame is None:
+			self.frame = self.Texture(self.renderer, self.size, target=True)
+			self.frame.blend_mode = 0  # Copied over the window as is
+			self.renderer.target = self.frame
+
+	def stop_readback(self):
+		if self.frame is not None:
+			self.renderer.target = None
+			self.frame = None
+
+	def read_pixels(self, target):
+		# Read back the frame at the logical size (target has that size); needs start_readback() first
+		self.renderer.to_surface(target)
+
+	def present(self):
+		if self.frame is not None:
+			self.renderer.target = None
+			self.renderer.draw_color = (0, 0, 0, 255)
+			self.renderer.clear()
+			self.frame.draw()
+			self.renderer.present()
+			self.renderer.target = self.frame
+			self.renderer.clear()
+			return
+		self.renderer.present()
+		# Clear so the letterbox bars stay black when the window is resized
+		self.renderer.draw_color = (0, 0, 0, 255)
+		self.renderer.clear()
+
+	def close(self):
+		# Textures must go before the renderer, and the renderer before the window
+		self.stop_readback()
+		self.textures.clear()
+		self.renderer = None
+		self.window.destroy()
+
+
+def create_renderer(name, size, caption, scale=1):
+	# name is 'surface' (default), 'sdl2' or 'sdl2-software'
+	if name in ('sdl2', 'sdl2-software'):
+		try:
+			return TextureRenderer(size, caption, scale, software=name == 'sdl2-software')
+		except Exception as e:
+			print(f"SDL2 renderer unavailable: {e}. Falling back to surface rendering.")
+	return SurfaceRenderer(size, caption)
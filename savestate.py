@@ -0,0 +1,192 @@
+#suspend/resume: an in-progress run (the world snapshot plus the session around it) packed into a small
+#versioned binary blob, stored atomically in a file on desktop or in localStorage in the browser build
+#layout: header (magic, version, payload size, CRC-32) then the payload, all little-endian;
+#change the payload layout and the version goes up, and saves of another version are ignored
+import os
+import sys
+import zlib
+import base64
+import struct
+import time
+
+MAGIC = b'HOPS'
+VERSION = 1
+HEADER = struct.Struct('<4sHII')
+SAVE_NAME = 'hopit-save.bin'  # File name on desktop, localStorage key in the browser
+
+HERO_SPRITES = ('jump1', 'jump2', 'jump3', 'jet')
+HERO = struct.Struct('<ddd??i?iiiiB')
+FLOOR = struct.Struct('<ddibiibb')  # x, y, width, is_moving, movement_timer, move_direction, move_speed, alive
+WORLD = struct.Struct('<qdd?q')  # player_height, camera_y, camera_shift, end_state, schedule order
+COUNT = struct.Struct('<H')
+POSITION = struct.Struct('<dd')
+EVENT = struct.Struct('<dq')  # Schedule entry: height, order
+RNG = struct.Struct('<625I?d')  # Mersenne Twister state and the cached gauss value
+#the game around the world: audio toggles, theme, sound and instruction flags, background scroll
+SESSION_FIELDS = ('music_on', 'sfx_on', 'theme_index', 'level_up_played', 'new_high_score', 'show_instructions',
+				  'instruction_timer', 'background_offset', 'clouds_offset')
+SESSION = struct.Struct('<??B???idd')
+
+
+def encode(state, session):
+	# state is World.snapshot(), session a dict with SESSION_FIELDS
+	(hero, floors, pickups, last_floor, player_height, camera_y, camera_shift, end_state,
+	 (heap, order), rng_state) = state
+	parts = [HERO.pack(*hero[:11], HERO_SPRITES.index(hero[11]))]
+	parts.append(COUNT.pack(len(floors) // 7))
+	for i in range(0, len(floors), 7):
+		parts.append(FLOOR.pack(*floors[i:i + 7], True))
+	parts.append(FLOOR.pack(*last_floor))
+	parts.append(COUNT.pack(len(pickups) // 3))
+	for i in range(0, len(pickups), 3):
+		parts.append(pack_name(pickups[i]))
+		parts.append(POSITION.pack(pickups[i + 1], pickups[i + 2]))
+	parts.append(WORLD.pack(player_height, camera_y, camera_shift, end_state, order))
+	parts.append(COUNT.pack(len(heap)))
+	for height, event_order, name in heap:
+		parts.append(EVENT.pack(height, event_order))
+		parts.append(pack_name(name))
+	version, internal, gauss = rng_state
+	parts.append(RNG.pack(*internal, gauss is not None, gauss or 0.0))
+	parts.append(SESSION.pack(*(session[field] for field in SESSION_FIELDS)))
+	payload = b''.join(parts)
+	return HEADER.pack(MAGIC, VERSION, len(payload), zlib.crc32(payload)) + payload
+
+def decode(blob):
+	# Back to (state, session); raises ValueError for anything that isn't a save of this version
+	if len(blob) < HEADER.size:
+		raise ValueError('too short')
+	magic, version, size, crc = HEADER.unpack_from(blob)
+	if magic != MAGIC:
+		raise ValueError('not a save')
+	if version != VERSION:
+		raise ValueError(f'version {version}, expected {VERSION}')
+	payload = blob[HEADER.size:]
+	if len(payload) != size or zlib.crc32(payload) != crc:
+		raise ValueError('damaged')
+	reader = Reader(payload)
+	values = reader.read(HERO)
+	hero = values[:11] + (HERO_SPRITES[values[11]],)
+	floors = []
+	for i in range(reader.read(COUNT)[0]):
+		floors += fix_floor(reader.read(FLOOR))[:7]
+	last_floor = fix_floor(reader.read(FLOOR))
+	pickups = []
+	for i in range(reader.read(COUNT)[0]):
+		pickups.append(reader.read_name())
+		pickups += reader.read(POSITION)
+	player_height, camera_y, camera_shift, end_state, order = reader.read(WORLD)
+	heap = []
+	for i in range(reader.read(COUNT)[0]):
+		height, event_order = reader.read(EVENT)
+		heap.append((height, event_order, reader.read_name()))
+	values = reader.read(RNG)
+	rng_state = (3, values[:625], values[626] if values[625] else None)
+	session = dict(zip(SESSION_FIELDS, reader.read(SESSION)))
+	state = (hero, tuple(floors), tuple(pickups), last_floor, player_height, camera_y, camera_shift, end_state,
+			 (tuple(heap), order), rng_state)
+	return state, session
+
+
+def pack_name(name):
+	data = name.encode()
+	return bytes((len(data),)) + data
+
+def fix_floor(values):
+	# is_moving and alive were packed as bytes
+	x, y, width, is_moving, timer, direction, speed, alive = values
+	return (x, y, width, bool(is_moving), timer, direction, speed, bool(alive))
+
+
+class Reader():
+	def __init__(self, data):
+		self.data = data
+		self.offset = 0
+
+	def read(self, layout):
+		values = layout.unpack_from(self.data, self.offset)
+		self.offset += layout.size
+		return values
+
+	def read_name(self):
+		size = self.data[self.offset]
+		name = self.data[self.offset + 1:self.offset + 1 + size].decode()
+		self.offset += 1 + size
+		return name
+
+
+#where the blob lives: a file next to the score on desktop, localStorage under pygbag
+class SaveSlot():
+	def __init__(self, directory, name=SAVE_NAME):
+		self.path = os.path.join(directory, name)
+		self.key = name
+		self.storage = None
+		self.last_ms = None  # Time taken by the last save or load
+		if sys.platform == 'emscripten':
+			try:
+				import platform
+				self.storage = platform.window.localStorage
+			except Exception as e:
+				print(f"Browser storage unavailable: {e}. Runs will not be kept.")
+
+	def write(self, blob):
+		try:
+			if self.storage is not None:
+				# One setItem replaces the value in one go
+				self.storage.setItem(self.key, base64.b64encode(blob).decode('ascii'))
+			else:
+				# Written beside the save, then renamed over it, so a crash leaves the old save or the new one
+				temporary = self.path + '.tmp'
+				with open(temporary, 'wb') as file:
+					file.write(blob)
+				os.replace(temporary, self.path)
+			return True
+		except Exception as e:
+			print(f"Could not save the run: {e}")
+			return False
+
+	def read(self):
+		try:
+			if self.storage is not None:
+				text = self.storage.getItem(self.key)
+				return base64.b64decode(text) if text else None
+			if os.path.exists(self.path):
+				with open(self.path, 'rb') as file:
+					return file.read()
+		except Exception as e:
+			print(f"Could not read the saved run: {e}")
+		return None
+
+	def clear(self):
+		try:
+			if self.storage is not None:
+				self.storage.removeItem(self.key)
+			elif os.path.exists(self.path):
+				os.remove(self.path)
+		except Exception as e:
+			print(f"Could not remove the saved run: {e}")
+
+	def save(self, state, session):
+		start = time.perf_counter()
+		saved = self.write(encode(state, session))
+		self.last_ms = (time.perf_counter() - start) * 1000
+		return saved
+
+	def load(self):
+		# (state, session) of the saved run, or None
+		start = time.perf_counter()
+		blob = self.read()
+		if blob is None:
+			return None
+		try:
+			run = decode(blob)
+		except Exception as e:
+			print(f"Ignoring the saved run ({e})")
+			self.clear()
+			return None
+		self.last_ms = (time.perf_counter() - start) * 1000
+		return run
+
+	def status(self):
+		# One line for the performance overlay
+		return 'none yet' if self.last_ms is None else f'{self.last_ms:.2f} ms'
@@ -0,0 +1,72 @@
+#scenes: each screen of the game (home, playing, game over) is a scene with enter/exit hooks
+#while one scene runs, the scenes that can follow it get ready in the spare time after each frame,
+#so switching to them only has to swap in what was built, e.g. the next run's floors for retry
+import time
+
+
+class Scene():
+	def __init__(self, state, name, next_states=()):
+		self.state = state  # Key of the scene, also its UI layer
+		self.name = name
+		self.next_states = next_states  # Scenes that can follow this one; they are prepared while it runs
+		self.intro = None  # Timeline that a click, touch or key press skips to the end
+		self.idle_fps = None  # Frame rate once nothing animates, 0 to sleep until input; None never idles
+
+	def idle(self):
+		# The screen can slow down: it has an idle rate and its intro has finished
+		return self.idle_fps is not None and (self.intro is None or self.intro.done)
+
+	def prepare(self):
+		# Get ready to be entered soon; runs once after the frame is presented
+		pass
+
+	def enter(self, previous):
+		# previous is the scene being left, None at startup
+		pass
+
+	def exit(self, next_scene):
+		# Release what this scene alone uses
+		pass
+
+	def update(self, dt):
+		# Update and draw one frame
+		pass
+
+
+class SceneManager():
+	def __init__(self):
+		self.scenes = {}
+		self.current = None
+		self.pending = []  # Scenes to prepare after the frame is presented
+		self.switch_ms = 0.0  # Time taken by the last switch (exit + enter)
+
+	def add(self, scene):
+		self.scenes[scene.state] = scene
+		return scene
+
+	@property
+	def state(self):
+		return self.current.state
+
+	def switch(self, state):
+		start = time.perf_counter()
+		previous = self.current
+		scene = self.scenes[state]
+		if previous is not None:
+			previous.exit(scene)
+		self.current = scene
+		scene.enter(previous)
+		self.switch_ms = (time.perf_counter() - start) * 1000
+		self.pending = [self.scenes[next_state] for next_state in scene.next_states]
+
+	def update(self, dt):
+		self.current.update(dt)
+
+	def work(self):
+		# Prepare the scenes that can come next; call once the frame has been presented
+		while self.pending:
+			self.pending.pop().prepare()
+
+	def status(self):
+		# One line for the performance overlay
+		return f'{self.current.name}, last switch {self.switch_ms:.2f} ms'
@@ -0,0 +1,58 @@
+#keyed caches for surfaces that are expensive to build (rendered text, scaled or tinted images)
+from collections import OrderedDict
+
+#every cache registers itself here so the performance HUD can report hit rates
+caches = []
+
+
+class SurfaceCache():
+	def __init__(self, name, max_items=256, max_bytes=None):
+		self.name = name
+		self.max_items = max_items
+		self.max_bytes = max_bytes  # Optional cap on pixel memory; entries must then be surfaces
+		self.bytes = 0
+		self.items = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+		caches.append(self)
+
+	def get(self, key, factory, *args):
+		# Return the cached surface for key, building it with factory(*args) on a miss
+		surface = self.items.get(key)
+		if surface is not None:
+			self.hits += 1
+			self.items.move_to_end(key)
+			return surface
+		self.misses += 1
+		surface = factory(*args)
+		self.put(key, surface)
+		return surface
+
+	def put(self, key, surface):
+		# Add a surface built elsewhere (e.g. ahead of time), evicting the least recently used over the caps
+		if self.max_bytes is not None:
+			if key in self.items:
+				self.bytes -= surface_bytes(self.items[key])
+			self.bytes += surface_bytes(surface)
+		self.items[key] = surface
+		self.items.move_to_end(key)
+		while len(self.items) > self.max_items or (self.max_bytes is not None and self.bytes > self.max_bytes
+												   and len(self.items) > 1):
+			dropped = self.items.popitem(last=False)[1]
+			if self.max_bytes is not None:
+				self.bytes -= surface_bytes(dropped)
+
+	def __contains__(self, key):
+		return key in self.items
+
+	def hit_rate(self):
+		lookups = self.hits + self.misses
+		return self.hits / lookups if lookups else 0.0
+
+	def clear(self):
+		self.items.clear()
+		self.bytes = 0
+
+
+def surface_bytes(surface):
+	return surface.get_pitch() * surface.get_height()
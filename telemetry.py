@@ -0,0 +1,163 @@
+#per-frame telemetry: phase timers and counters kept in a preallocated ring buffer
+import cProfile
+import csv
+import json
+import os
+import time
+from array import array
+
+#phases in the order the game loop normally runs them
+PHASES = ('clock.tick wait', 'hero.update', 'background', 'spawning', 'floor_group.update',
+		  'sprite draw', 'text', 'input', 'display.update')
+PHASE_TICK, PHASE_HERO, PHASE_BACKGROUND, PHASE_SPAWNING, PHASE_FLOORS, \
+	PHASE_SPRITES, PHASE_TEXT, PHASE_INPUT, PHASE_DISPLAY = range(len(PHASES))
+
+COUNTERS = ('floors', 'pickups', 'collisions tested')
+COUNTER_FLOORS, COUNTER_PICKUPS, COUNTER_COLLISIONS = range(len(COUNTERS))
+
+
+class FrameTelemetry():
+	def __init__(self, capacity=1200, enabled=False, output_dir='.'):
+		self.capacity = capacity
+		# Recording is on while anyone wants it: 'trace' (F9/--telemetry), 'hud' (F3) or 'audit' (F7),
+		# so one of them stopping doesn't cut off the others
+		self.owners = {'trace'} if enabled else set()
+		self.enabled = enabled
+		self.output_dir = output_dir
+		# One row per frame: [frame start, phase durations..., counters...], all in seconds/units
+		self.stride = 1 + len(PHASES) + len(COUNTERS)
+		self.counter_base = 1 + len(PHASES)
+		self.buffer = array('d', bytes(8 * self.stride * capacity))
+		self.zero_row = array('d', bytes(8 * self.stride))
+		self.frame_count = 0
+		self.row = 0  # Offset of the current frame's row in the buffer
+		self.start_time = time.perf_counter()
+		self.last_mark = self.start_time
+		self.profiler = None
+		self.audit = None  # Allocation audit sharing the phase marks, when running
+
+	def begin_frame(self):
+		if self.enabled:
+			now = time.perf_counter()
+			self.row = (self.frame_count % self.capacity) * self.stride
+			self.frame_count += 1
+			self.buffer[self.row:self.row + self.stride] = self.zero_row
+			self.buffer[self.row] = now - self.start_time
+			if self.audit is not None:
+				self.audit.begin_frame()
+				now = time.perf_counter()
+			self.last_mark = now
+
+	def mark(self, phase):
+		# Charge the time since the previous mark to the given phase
+		if self.enabled:
+			now = time.perf_counter()
+			self.buffer[self.row + 1 + phase] += now - self.last_mark
+			if self.audit is not None:
+				self.audit.mark(phase)
+				now = time.perf_counter()  # Leave the audit's own cost out of the next phase
+			self.last_mark = now
+
+	def count(self, counter, amount=1):
+		if self.enabled:
+			self.buffer[self.row + self.counter_base + counter] += amount
+
+	def set_count(self, counter, value):
+		if self.enabled:
+			self.buffer[self.row + self.counter_base + counter] = value
+
+	def set_enabled(self, owner, enabled):
+		if enabled:
+			if not self.owners:
+				self.frame_count = 0
+				self.last_mark = time.perf_counter()
+			self.owners.add(owner)
+		else:
+			self.owners.discard(owner)
+		self.enabled = bool(self.owners)
+
+	def recording(self, owner):
+		return owner in self.owners
+
+	def recent_phase_ms(self, count):
+		# Average milliseconds per phase over the last count completed frames
+		totals = [0.0] * len(PHASES)
+		completed = min(self.frame_count - 1, self.capacity - 1, count)
+		for back in range(2, completed + 2):
+			row = ((self.frame_count - back) % self.capacity) * self.stride
+			for phase in range(len(PHASES)):
+				totals[phase] += self.buffer[row + 1 + phase]
+		if completed > 0:
+			totals = [total * 1000 / completed for total in totals]
+		return totals
+
+	def frames(self):
+		# Yield recorded rows oldest first
+		recorded = min(self.frame_count, self.capacity)
+		first = self.frame_count - recorded
+		for index in range(first, self.frame_count):
+			row = (index % self.capacity) * self.stride
+			yield index, self.buffer[row:row + self.stride]
+
+	def export_chrome_trace(self, path):
+		events = []
+		for index, row in self.frames():
+			start_us = row[0] * 1e6
+			phase_time = start_us
+			total = 0.0
+			for phase, name in enumerate(PHASES):
+				duration_us = row[1 + phase] * 1e6
+				if duration_us > 0:
+					events.append({'name': name, 'cat': 'phase', 'ph': 'X', 'pid': 1, 'tid': 1,
+								   'ts': round(phase_time, 3), 'dur': round(duration_us, 3)})
+					phase_time += duration_us
+					total += duration_us
+			events.append({'name': 'frame', 'cat': 'frame', 'ph': 'X', 'pid': 1, 'tid': 0,
+						   'ts': round(start_us, 3), 'dur': round(total, 3), 'args': {'frame': index}})
+			events.append({'name': 'counters', 'ph': 'C', 'pid': 1, 'ts': round(start_us, 3),
+						   'args': {name: row[self.counter_base + i] for i, name in enumerate(COUNTERS)}})
+		with open(path, 'w') as file:
+			json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file)
+
+	def export_csv(self, path):
+		with open(path, 'w', newline='') as file:
+			writer = csv.writer(file)
+			writer.writerow(['frame', 'start_ms'] + [name + '_ms' for name in PHASES] + list(COUNTERS))
+			for index, row in self.frames():
+				writer.writerow([index, round(row[0] * 1000, 3)]
+								+ [round(row[1 + phase] * 1000, 3) for phase in range(len(PHASES))]
+								+ [int(row[self.counter_base + i]) for i in range(len(COUNTERS))])
+
+	def dump(self):
+		# Write the buffer as Chrome trace JSON (load in chrome://tracing or Perfetto) and CSV
+		stamp = time.strftime('%Y%m%d-%H%M%S')
+		base = os.path.join(self.output_dir, 'hopit-trace-' + stamp)
+		try:
+			self.export_chrome_trace(base + '.json')
+			self.export_csv(base + '.csv')
+			print(f"Telemetry written to {base}.json and {base}.csv")
+		except Exception as e:
+			print(f"Could not write telemetry: {e}")
+
+	def toggle_profiler(self):
+		# Start a cProfile capture, or stop the running one and save it
+		if self.profiler is None:
+			self.profiler = cProfile.Profile()
+			self.profiler.enable()
+			print("cProfile capture started")
+		else:
+			self.profiler.disable()
+			path = os.path.join(self.output_dir, 'hopit-profile-' + time.strftime('%Y%m%d-%H%M%S') + '.prof')
+			try:
+				self.profiler.dump_stats(path)
+				print(f"cProfile capture written to {path}")
+			except Exception as e:
+				print(f"Could not write profile: {e}")
+			self.profiler = None
+
+	def close(self):
+		# Called on quit: flush a trace that is being recorded
+		if self.profiler is not None:
+			self.toggle_profiler()
+		if self.recording('trace') and self.frame_count:
+			self.dump()
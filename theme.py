@@ -0,0 +1,55 @@
+#theme asset layer: the buttons and platforms are tinted to the current theme
+#tinted variants are made on first use, or ahead of time a few per frame, and cached per theme under a memory cap
+import time
+from collections import deque
+import pygame
+from surfcache import SurfaceCache
+
+THEME_CACHE_BYTES = 8 * 1024 * 1024  # Pixel memory kept for tinted images, across all themes
+PREWARM_BUDGET = 0.001  # Seconds per frame spent tinting ahead of time
+
+
+def theme_tint(color):
+	# Halfway between white and the theme color, so images keep their contrast
+	return tuple((255 + channel) // 2 for channel in color)
+
+def tint(image, color):
+	# Multiply RGB by the tint, alpha untouched
+	tinted = image.copy()
+	tinted.fill(color, special_flags=pygame.BLEND_RGB_MULT)
+	return tinted
+
+
+class ThemeAssets():
+	def __init__(self, tints, max_bytes=THEME_CACHE_BYTES):
+		self.tints = tints  # Per theme: RGB multiplier, or None to use the images as they are
+		self.images = []  # Images that follow the theme
+		self.cache = SurfaceCache('theme tints', 1024, max_bytes)
+		self.pending = deque()  # (theme, image) still to be tinted ahead of time
+
+	def add(self, image):
+		self.images.append(image)
+		return image
+
+	def get(self, image, theme):
+		# A miss here means the frame waits on a tint; pre-warming keeps that off theme switches
+		color = self.tints[theme]
+		if color is None:
+			return image
+		return self.cache.get((image, theme), tint, image, color)
+
+	def prewarm(self, theme):
+		# Queue every themed image for work(), e.g. for the theme after the current one
+		if self.tints[theme] is not None:
+			for image in self.images:
+				self.pending.append((theme, image))
+
+	def work(self, budget=PREWARM_BUDGET):
+		# Tint queued images for up to budget seconds; call once the frame has been presented
+		if not self.pending:
+			return
+		deadline = time.perf_counter() + budget
+		while self.pending and time.perf_counter() < deadline:
+			theme, image = self.pending.popleft()
+			if (image, theme) not in self.cache:
+				self.cache.put((image, theme), tint(image, self.tints[theme]))
@@ -0,0 +1,88 @@
+#time-based tweens: animations declared with durations in seconds and evaluated from elapsed time,
+#so they play at the same speed whatever the frame rate
+
+
+#easing functions map progress 0-1 to eased progress
+def linear(t):
+	return t
+
+def ease_out_quad(t):
+	return 1 - (1 - t) * (1 - t)
+
+def ease_in_out_quad(t):
+	return 2 * t * t if t < 0.5 else 1 - 2 * (1 - t) * (1 - t)
+
+def ease_out_cubic(t):
+	return 1 - (1 - t) ** 3
+
+
+class Tween():
+	def __init__(self, setter, start, end, duration, delay=0.0, easing=linear):
+		self.setter = setter  # Called with the tweened value
+		self.start = start
+		self.end = end
+		self.duration = duration
+		self.delay = delay
+		self.easing = easing
+		self.end_time = delay + duration
+
+	def value_at(self, elapsed):
+		if elapsed >= self.end_time or self.duration <= 0:
+			return self.end
+		progress = max(0.0, (elapsed - self.delay) / self.duration)
+		return self.start + (self.end - self.start) * self.easing(progress)
+
+
+class Timeline():
+	def __init__(self):
+		self.tweens = []
+		self.elapsed = 0.0
+		self.duration = 0.0
+		self.done = True
+		self.frames = 0
+		self.pending = 0.0  # Time not yet applied when updating every few frames
+
+	def add(self, setter, start, end, duration, delay=0.0, easing=linear):
+		# Tweens on the same setter may follow each other; they are applied in start order
+		self.tweens.append(Tween(setter, start, end, duration, delay, easing))
+		self.tweens.sort(key=lambda tween: tween.delay)
+		self.duration = max(self.duration, delay + duration)
+		return self
+
+	def restart(self):
+		self.elapsed = 0.0
+		self.pending = 0.0
+		self.frames = 0
+		self.done = False
+		# Put every animated value at the start of its first tween
+		started = set()
+		for tween in self.tweens:
+			if tween.setter not in started:
+				started.add(tween.setter)
+				tween.setter(tween.start)
+
+	def apply(self):
+		for tween in self.tweens:
+			if tween.delay <= self.elapsed:
+				tween.setter(tween.value_at(self.elapsed))
+
+	def update(self, dt, every=1):
+		# Advance by dt seconds; every > 1 only re-evaluates on every n-th call
+		if self.done:
+			return
+		self.pending += dt
+		self.frames += 1
+		if self.frames % every:
+			return
+		self.elapsed += self.pending
+		self.pending = 0.0
+		self.apply()
+		if self.elapsed >= self.duration:
+			self.done = True
+
+	def skip(self):
+		# Jump straight to the end state
+		if not self.done:
+			self.elapsed = self.duration
+			self.apply()
+			self.done = True
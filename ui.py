@@ -0,0 +1,240 @@
+#retained-mode UI: widgets live in per-screen layers and receive input events once per frame by hit-testing
+import pygame
+
+
+#button class
+class Button():
+	def __init__(self, x, y, image, scale, alt_image=None, on_click=None):
+		width = image.get_width()
+		height = image.get_height()
+		self.original_image = image
+		self.alt_image = alt_image  # Alternative image for different states (e.g., on/off)
+		self.current_image = image  # Track which image is currently being used
+		self.original_scale = scale
+		self.current_scale = scale
+		self.on_click = on_click  # Called once the press animation has finished
+
+		# Size the button to the scaled image; scaling itself happens when drawing
+		new_width = int(width * scale)
+		new_height = int(height * scale)
+		self.rect = pygame.Rect(x, y, new_width, new_height)
+
+		# Store original dimensions for scaling
+		self.original_width = width
+		self.original_height = height
+		self.center_x = x + (width * scale) // 2
+		self.center_y = y + (height * scale) // 2
+
+		# Click animation properties
+		self.click_animation = False
+		self.click_scale = scale
+		self.click_timer = 0.0
+		self.click_duration = 0.1  # Seconds; short for a fast, responsive animation
+		self.visible = True  # Control visibility of button
+		self.pointers = set()  # Mouse/fingers currently holding the button
+		self.slide = False  # Held rather than clicked: a finger sliding on or off presses or releases it
+		self.image = None  # current_image prepared at the button's size by the renderer
+		self.dirty = True  # Image or size changed since image was prepared
+
+	@property
+	def held(self):
+		return len(self.pointers) > 0
+
+	def set_image(self, use_alt_image):
+		# Switch between original and alternative image
+		if use_alt_image and self.alt_image:
+			self.current_image = self.alt_image
+		else:
+			self.current_image = self.original_image
+		self.update_scale(self.current_scale)
+
+	def update_scale(self, new_scale):
+		# Update button scale and maintain center position
+		self.current_scale = new_scale
+		new_width = int(self.original_width * new_scale)
+		new_height = int(self.original_height * new_scale)
+
+		# Update rectangle and position to keep button centered
+		self.rect = pygame.Rect(0, 0, new_width, new_height)
+		self.rect.centerx = self.center_x
+		self.rect.centery = self.center_y
+		self.dirty = True
+
+	def set_y(self, y):
+		# Move the button vertically (used by the slide-in animations)
+		self.rect.y = y
+		self.center_y = self.rect.centery
+
+	def contains(self, pos):
+		return self.visible and self.rect.collidepoint(pos)
+
+	def press(self, pointer):
+		self.pointers.add(pointer)
+		if self.click_animation:
+			return False
+		# Start click animation
+		self.click_animation = True
+		self.click_timer = 0.0
+		self.click_scale = self.current_scale
+		return True
+
+	def release(self, pointer):
+		self.pointers.discard(pointer)
+
+	def cancel(self):
+		# Drop any hold and finish a running animation without firing on_click
+		self.pointers.clear()
+		if self.click_animation:
+			self.click_animation = False
+			self.update_scale(self.click_scale)
+
+	def update(self, dt):
+		# Advance the click animation by dt seconds; returns False once it has finished
+		self.click_timer += dt
+		half = self.click_duration / 2
+
+		# First phase: shrink more dramatically
+		if self.click_timer <= half:
+			# Shrink to 70% of original scale for more noticeable effect
+			scale_factor = self.click_scale * (1.0 - 0.3 * (self.click_timer / half))
+			self.update_scale(scale_factor)
+		# Second phase: expand back with slight bounce
+		elif self.click_timer < self.click_duration:
+			# Expand back to original scale with slight overshoot
+			progress = (self.click_timer - half) / half
+			scale_factor = self.click_scale * (0.7 + 0.35 * progress)  # Slightly overshoot for bounce effect
+			self.update_scale(scale_factor)
+		else:
+			# Animation complete
+			self.click_animation = False
+			self.update_scale(self.click_scale)
+			if self.on_click:
+				self.on_click()
+			return False
+		return True
+
+	def draw(self, gfx):
+		if self.visible:
+			# Scaled once per change (a click animation, an image switch), not once per frame
+			if self.dirty:
+				self.image = gfx.prepare(self.current_image, size=self.rect.size)
+				self.dirty = False
+			gfx.blit(self.image, self.rect.topleft)
+
+
+#static image such as the logo; it is drawn with its layer but never takes input
+class Picture():
+	def __init__(self, x, y, image):
+		self.image = image
+		self.rect = image.get_rect(topleft=(x, y))
+		self.visible = True
+
+	def set_y(self, y):
+		self.rect.y = y
+
+	def contains(self, pos):
+		return False
+
+	def cancel(self):
+		pass
+
+	def draw(self, gfx):
+		if self.visible:
+			gfx.blit(self.image, self.rect.topleft)
+
+
+#root of the widget tree: one layer of widgets per screen, only the active layer takes new presses
+class UI():
+	def __init__(self, gfx):
+		self.gfx = gfx
+		self.layers = {}
+		self.active = None
+		self.captured = {}  # Pointer -> widget it went down on, so releases reach it on any screen
+		self.animating = []  # Widgets with a running click animation; the rest are left alone
+
+	def add(self, layer, widget):
+		self.layers.setdefault(layer, []).append(widget)
+		return widget
+
+	def set_active(self, layer):
+		if layer != self.active:
+			# Leaving a screen releases anything still held on it
+			self.cancel_all()
+			self.active = layer
+
+	def cancel_all(self):
+		# Drop every hold on the current screen, e.g. when the window loses focus and releases never arrive
+		for widget in self.layers.get(self.active, ()):
+			widget.cancel()
+		self.captured.clear()
+		self.animating = [widget for widget in self.animating if widget.click_animation]
+
+	def widget_at(self, pos):
+		# Topmost visible widget under pos
+		for widget in reversed(self.layers.get(self.active, ())):
+			if widget.contains(pos):
+				return widget
+		return None
+
+	def press(self, pointer, pos):
+		widget = self.widget_at(pos)
+		if widget is not None:
+			self.captured[pointer] = widget
+			if widget.press(pointer):
+				self.animating.append(widget)
+		return widget is not None
+
+	def release(self, pointer):
+		widget = self.captured.pop(pointer, None)
+		if widget is not None:
+			widget.release(pointer)
+		return widget is not None
+
+	def move(self, pointer, pos):
+		# A pointer moving while down: holds on slide buttons follow it, clicks stay where they went down
+		widget = self.captured.get(pointer)
+		if widget is not None and not widget.slide:
+			return True
+		target = self.widget_at(pos)
+		if target is not None and not getattr(target, 'slide', False):
+			target = None
+		if target is not widget:
+			if widget is not None:
+				self.release(pointer)
+			if target is not None:
+				self.press(pointer, pos)
+		return target is not None
+
+	def handle_event(self, event):
+		# Returns True when the event was consumed by a widget
+		if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+			# SDL also reports touches as mouse events; those come through as FINGER events below
+			if not getattr(event, 'touch', False):
+				return self.press('mouse', event.pos)
+		elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+			return self.release('mouse')
+		elif event.type == pygame.FINGERDOWN:
+			return self.press(('finger', event.touch_id, event.finger_id), self.gfx.finger_pos(event))
+		elif event.type == pygame.FINGERUP:
+			return self.release(('finger', event.touch_id, event.finger_id))
+		elif event.type == pygame.FINGERMOTION:
+			return self.move(('finger', event.touch_id, event.finger_id), self.gfx.finger_pos(event))
+		elif event.type == pygame.MOUSEMOTION and event.buttons[0] and not getattr(event, 'touch', False):
+			return self.move('mouse', event.pos)
+		return False
+
+	def update(self, dt):
+		# Step click animations; on_click callbacks fire from here
+		if self.animating:
+			animating = self.animating
+			self.animating = []
+			for widget in animating:
+				# A callback may have switched screens and cancelled later widgets
+				if widget.click_animation and widget.update(dt):
+					self.animating.append(widget)
+
+	def draw(self, gfx):
+		# Every widget is drawn each frame: the background under them scrolls and the renderer starts
+		# each frame from a cleared target, so a widget left out would vanish
+		for widget in self.layers.get(self.active, ()):
+			widget.draw(gfx)
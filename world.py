@@ -0,0 +1,452 @@
+#game rules without drawing or sound: hero physics, floors, power-ups, spawning and scoring
+#the world runs headless (no display needed) and can be snapshotted to plain tuples and restored
+#positions are world coordinates (floats, y grows downward, 0 is the top of the starting screen);
+#the camera is a single offset, screen y = world y - camera_y, applied only when drawing
+import heapq
+import random
+import pygame
+from powerups import POWERUPS, Pickup
+
+SCREEN_WIDTH = 400
+SCREEN_HEIGHT = 600
+CAMERA_BOUNDARY = 200
+FALL_SPEED = 0.7  # For falling speed
+MAX_FLOORS = 10
+FLOOR_HEIGHT = 20
+
+
+#player class
+class Hero():
+	def __init__(self, x, y):
+		self.width = 25  # Hitbox size; the sprite is drawn larger around it
+		self.height = 40
+		self.animation_speed = 15
+		self.key_left = False  # Arrow keys
+		self.key_right = False
+		self.reset(x, y)
+
+	def reset(self, x, y):
+		# Start of a run: everything but the held arrow keys, which follow the keyboard
+		self.sprite = 'jump1'  # Animation frame: jump1, jump2, jump3 or jet
+		self.center_on(x, y)
+		self.vertical_speed = 0
+		self.facing_left = False
+		self.has_bounced = False
+		self.animation_timer = 0
+		self.has_jet = False
+		self.jet_timer = 0
+		self.jet_platforms = 0
+		self.move_left = False  # On-screen buttons
+		self.move_right = False
+		self.left_press_time = 0
+		self.right_press_time = 0
+
+	def center_on(self, x, y):
+		self.x = x - self.width // 2  # Top-left corner of the hitbox
+		self.y = y - self.height // 2
+
+	def update(self, world):
+		#reset movement variables
+		camera_shift = 0
+		horizontal_move = 0
+		vertical_move = 0
+
+		#handle keyboard input
+		if self.key_left:
+			horizontal_move = -10
+			self.facing_left = True
+		elif self.move_left:  # On-screen button input
+			self.left_press_time += 1
+			if self.left_press_time < 10:  # Short press
+				horizontal_move = -5  # Slower speed for quick taps
+			else:  # Long press
+				horizontal_move = -8  # Normal speed for held press
+			self.facing_left = True
+		if self.key_right:
+			horizontal_move = 10
+			self.facing_left = False
+		elif self.move_right:  # On-screen button input
+			self.right_press_time += 1
+			if self.right_press_time < 10:  # Short press
+				horizontal_move = 5  # Slower speed for quick taps
+			else:  # Long press
+				horizontal_move = 8  # Normal speed for held press
+			self.facing_left = False
+
+		#reset movement flags
+		if not self.move_left:
+			self.left_press_time = 0
+		if not self.move_right:
+			self.right_press_time = 0
+		self.move_left = False
+		self.move_right = False
+
+		#apply gravity physics
+		if not self.has_jet:
+			self.vertical_speed += FALL_SPEED
+		vertical_move += self.vertical_speed
+
+		#update animation
+		self.animation_timer += 1
+		if self.has_jet:
+			self.sprite = 'jet'
+			self.jet_timer += 1
+			if self.jet_timer >= 20:  # Reduced from 30 to 20 frames for shorter duration
+				self.jet_timer = 0
+				self.jet_platforms += 1
+				if self.jet_platforms >= 3:  # Reduced from 5 to 3 platforms
+					self.has_jet = False
+					self.jet_platforms = 0
+					self.sprite = 'jump1'
+		else:
+			if self.vertical_speed < 0:  # Going up
+				if self.animation_timer >= self.animation_speed:
+					self.animation_timer = 0
+					if self.sprite == 'jump1':
+						self.sprite = 'jump2'
+					else:
+						self.sprite = 'jump1'
+			else:  # Going down
+				if self.animation_timer >= self.animation_speed:
+					self.animation_timer = 0
+					if self.sprite == 'jump3':
+						self.sprite = 'jump1'
+					else:
+						self.sprite = 'jump3'
+
+		#prevent moving off screen edges
+		if self.x + horizontal_move < 0:
+			horizontal_move = -self.x
+		if self.x + self.width + horizontal_move > SCREEN_WIDTH:
+			horizontal_move = SCREEN_WIDTH - self.x - self.width
+
+		#check for floor collisions
+		for floor in world.floor_group:
+			#detect collision in vertical direction
+			if overlaps(floor, self.x, self.y + vertical_move, self.width, self.height):
+				#verify hero is above the floor
+				if self.y + self.height < floor.y + FLOOR_HEIGHT // 2:
+					#and, with collision masks, that its feet are over a solid part
+					if self.vertical_speed > 0 and (world.masks is None or world.masks.lands(self, floor)):
+						self.y = floor.y - self.height
+						vertical_move = 0
+						self.vertical_speed = -15
+						self.sprite = 'jump1'
+						self.animation_timer = 0
+						self.has_bounced = True
+						if world.on_land:
+							world.on_land()
+
+		#check for power-up collection
+		for pickup in world.pickup_group:
+			if overlaps(pickup, self.x, self.y, self.width, self.height) and (
+					world.masks is None or world.masks.touches(self, pickup)):
+				pickup.kill()
+				POWERUPS[pickup.kind].collect(world)
+				if world.on_pickup:
+					world.on_pickup(pickup.kind)
+
+		#scroll camera when hero reaches upper section of the screen
+		if self.y - world.camera_y <= CAMERA_BOUNDARY:
+			#only scroll during upward movement
+			if self.vertical_speed < 0:
+				camera_shift = -vertical_move
+
+		#update hero position
+		self.x += horizontal_move
+		self.y += vertical_move
+
+		return camera_shift
+
+
+#platform class
+class Floor(pygame.sprite.Sprite):
+	def __init__(self, x, y, width, is_moving, rng=random):
+		pygame.sprite.Sprite.__init__(self)
+		self.is_moving = is_moving
+		self.movement_timer = rng.randint(0, 50)
+		self.move_direction = rng.choice([-1, 1])
+		self.move_speed = rng.randint(1, 2)
+		self.x = x
+		self.y = y
+		self.width = width
+		self.height = FLOOR_HEIGHT
+
+	def update(self):
+		#handle horizontal movement (only called for moving floors)
+		self.movement_timer += 1
+
+		# Calculate the next position; half-pixel steps are kept, x is a float
+		next_x = self.x + (self.move_direction * (self.move_speed * 0.5))
+
+		# Check if the next position would be outside the screen boundaries
+		if next_x < 0 or next_x + self.width > SCREEN_WIDTH:
+			self.move_direction *= -1  # Reverse direction
+			self.movement_timer = 0
+		else:
+			self.x = next_x  # Only move if within boundaries
+
+		#change direction after timer expires
+		if self.movement_timer >= 100:
+			self.move_direction *= -1
+			self.movement_timer = 0
+
+
+#upcoming events by height: a heap of (height, order, name); each fires once, when the score
+#reaches its height, however far a single frame jumps
+class HeightSchedule():
+	def __init__(self):
+		self.heap = []
+		self.order = 0  # Events at the same height fire in the order they were added
+
+	def clear(self):
+		self.heap.clear()
+		self.order = 0
+
+	def add(self, height, name):
+		heapq.heappush(self.heap, (height, self.order, name))
+		self.order += 1
+
+	def next_height(self):
+		return self.heap[0][0] if self.heap else float('inf')
+
+	def pop(self):
+		height, order, name = heapq.heappop(self.heap)
+		return height, name
+
+
+class World():
+	def __init__(self, seed=None, pickup_sizes=None, masks=None):
+		self.rng = random.Random(seed)
+		self.rng_state = None  # Cached rng.getstate(), cleared whenever the RNG is drawn from
+		self.pickup_sizes = pickup_sizes or {}  # Power-up name -> pickup size, e.g. from its sprite
+		self.masks = masks  # CollisionMasks that settle rect hits pixel by pixel; None collides by rects alone
+		self.on_pickup = None  # Called with the power-up name when the hero collects one (sound effects)
+		self.on_land = None  # Called when the hero bounces off a floor (landing dust)
+		self.hero = Hero(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 150)
+		self.floor_group = pygame.sprite.Group()
+		self.pickup_group = pygame.sprite.Group()
+		self.schedule = HeightSchedule()
+		self.player_height = 0
+		self.camera_y = 0.0  # World y of the top of the screen; only ever decreases
+		self.camera_shift = 0  # How far the camera moved up this frame (background parallax)
+		self.end_state = False
+		self.floor = None  # Last spawned floor; new floors are placed above it
+		self.floor_pool = []  # Sprites reused by restore
+		self.pickup_pool = []
+		self.spare = None  # World that prepare_reset() builds the next run in
+		self.prepared = None  # Snapshot of that run, used by the next reset()
+		self.reset()
+
+	def prepare_reset(self):
+		# Build the start of the next run ahead of time, first screen of floors included, so reset() only
+		# has to restore it; the spare world is seeded from this one, so seeded worlds stay reproducible
+		if self.spare is None:
+			self.spare = World(pickup_sizes=self.pickup_sizes)
+		spare = self.spare
+		spare.rng.seed(self.rng.getrandbits(64))
+		self.rng_state = None
+		spare.reset()
+		while len(spare.floor_group) < MAX_FLOORS:
+			spare.spawn()
+		self.prepared = spare.snapshot()
+
+	def reset(self):
+		if self.prepared is not None:
+			state = self.prepared
+			self.prepared = None
+			self.restore(state)
+			return
+		self.player_height = 0
+		self.camera_y = 0.0
+		self.camera_shift = 0
+		self.end_state = False
+		# Reset the hero in place (the game holds on to it), so a run never inherits the last one's speed or jetpack
+		self.hero.reset(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 150)
+		# Reset floors and power-ups
+		self.floor_group.empty()
+		self.pickup_group.empty()
+		self.schedule.clear()
+		for name, powerup in POWERUPS.items():
+			self.schedule.add(powerup.first, name)
+		# Create starting floor
+		self.rng_state = None
+		self.floor = Floor(SCREEN_WIDTH // 2 - 50, SCREEN_HEIGHT - 50, 100, False, self.rng)
+		self.floor_group.add(self.floor)
+
+	#a frame is split in three so the game can draw and time each part
+	def update_hero(self):
+		self.camera_shift = self.hero.update(self)
+		self.camera_y -= self.camera_shift
+		return self.camera_shift
+
+	def spawn(self):
+		#generate floors
+		if len(self.floor_group) < MAX_FLOORS:
+			self.rng_state = None
+			floor_width = self.rng.randint(40, 60)
+			floor_x = self.rng.randint(0, SCREEN_WIDTH - floor_width)
+			floor_y = self.floor.y - self.rng.randint(80, 120)
+			floor_variant = self.rng.randint(1, 2)
+
+			# Enable moving floors at higher heights
+			if floor_variant == 1 and self.player_height > 500:
+				floor_moves = True
+			else:
+				floor_moves = False
+
+			self.floor = Floor(floor_x, floor_y, floor_width, floor_moves, self.rng)
+			self.floor_group.add(self.floor)
+
+		#generate power-ups whose height was reached
+		while self.schedule.next_height() <= self.player_height:
+			height, name = self.schedule.pop()
+			powerup = POWERUPS[name]
+			self.schedule.add(height + powerup.interval, name)
+			if sum(1 for pickup in self.pickup_group if pickup.kind == name) < powerup.max_active:
+				self.rng_state = None
+				pickup_x = self.rng.randint(50, SCREEN_WIDTH - 50)
+				pickup_y = self.floor.y - self.rng.randint(40, 60)  # Place between platforms
+				self.pickup_group.add(Pickup(name, pickup_x, pickup_y, self.pickup_size(name)))
+
+	def pickup_size(self, name):
+		return self.pickup_sizes.get(name, POWERUPS[name].size)
+
+	def update_entities(self):
+		#move floors; scrolling needs no per-entity work, the camera moved instead
+		for floor in self.floor_group:
+			if floor.is_moving:
+				floor.update()
+
+		#remove floors and power-ups that went off the bottom of the screen
+		bottom = self.camera_y + SCREEN_HEIGHT
+		cull(self.floor_group, bottom)
+		cull(self.pickup_group, bottom)
+
+		#player height score is how far the camera has risen
+		if self.camera_shift > 0:
+			self.player_height = int(-self.camera_y)
+
+		#check game over
+		if self.hero.y - self.camera_y > SCREEN_HEIGHT:
+			self.end_state = True
+
+	def on_screen(self, sprite):
+		#does sprite overlap the screen? tested while drawing, so nothing is collected per frame
+		return sprite.y < self.camera_y + SCREEN_HEIGHT and sprite.y + sprite.height > self.camera_y
+
+	def step(self):
+		self.update_hero()
+		self.spawn()
+		self.update_entities()
+		return self.camera_shift
+
+	#snapshot: flat tuples of plain values, cheap to take and to keep thousands of
+	#(hero, floors, pickups, last floor, player_height, camera_y, camera_shift, end_state, schedule, rng state)
+	def snapshot(self):
+		# Copying the Mersenne Twister state costs more than everything else together,
+		# and most frames spawn nothing, so the copy is shared until the RNG is used again
+		if self.rng_state is None:
+			self.rng_state = self.rng.getstate()
+		hero = self.hero
+		hero_state = (hero.x, hero.y, hero.vertical_speed, hero.facing_left, hero.has_bounced,
+					  hero.animation_timer, hero.has_jet, hero.jet_timer, hero.jet_platforms,
+					  hero.left_press_time, hero.right_press_time, hero.sprite)
+		floors = []
+		for floor in self.floor_group:
+			floors += (floor.x, floor.y, floor.width, floor.is_moving, floor.movement_timer,
+					   floor.move_direction, floor.move_speed)
+		pickups = []
+		for pickup in self.pickup_group:
+			pickups += (pickup.kind, pickup.x, pickup.y)
+		last = self.floor
+		last_floor = (last.x, last.y, last.width, last.is_moving, last.movement_timer,
+					  last.move_direction, last.move_speed, last.alive())
+		schedule = self.schedule
+		return (hero_state, tuple(floors), tuple(pickups), last_floor, self.player_height,
+				self.camera_y, self.camera_shift, self.end_state, (tuple(schedule.heap), schedule.order), self.rng_state)
+
+	def restore(self, state):
+		(hero_state, floors, pickups, last_floor, self.player_height,
+		 self.camera_y, self.camera_shift, self.end_state, schedule, rng_state) = state
+		hero = self.hero
+		(hero.x, hero.y, hero.vertical_speed, hero.facing_left, hero.has_bounced, hero.animation_timer, hero.has_jet,
+		 hero.jet_timer, hero.jet_platforms, hero.left_press_time, hero.right_press_time, hero.sprite) = hero_state
+		hero.move_left = False
+		hero.move_right = False
+
+		# Floors and pickups are written into pooled objects: no allocation, and no __init__ drawing from the RNG
+		count = len(floors) // 7
+		while len(self.floor_pool) < count:
+			self.floor_pool.append(blank_sprite(Floor, 0, FLOOR_HEIGHT))
+		restored = self.floor_pool[:count]
+		for i, floor in enumerate(restored):
+			set_floor(floor, floors, i * 7)
+		refill_group(self.floor_group, restored)
+		if last_floor[7]:
+			self.floor = restored[-1]
+		else:
+			# The last spawned floor already fell off the screen; it is only needed for spawn height
+			self.floor = set_floor(blank_sprite(Floor, 0, FLOOR_HEIGHT), last_floor, 0)
+
+		count = len(pickups) // 3
+		while len(self.pickup_pool) < count:
+			self.pickup_pool.append(blank_sprite(Pickup, 0, 0))
+		restored = self.pickup_pool[:count]
+		for i, pickup in enumerate(restored):
+			pickup.kind = pickups[i * 3]
+			pickup.width, pickup.height = self.pickup_size(pickup.kind)
+			pickup.x = pickups[i * 3 + 1]
+			pickup.y = pickups[i * 3 + 2]
+		refill_group(self.pickup_group, restored)
+
+		heap, self.schedule.order = schedule
+		self.schedule.heap[:] = heap
+
+		if rng_state is not self.rng_state:
+			self.rng.setstate(rng_state)
+			self.rng_state = rng_state
+
+
+#axis-aligned overlap of a sprite and a box, in float world coordinates (same edges as Rect.colliderect)
+def overlaps(sprite, x, y, width, height):
+	return (x < sprite.x + sprite.width and sprite.x < x + width and
+			y < sprite.y + sprite.height and sprite.y < y + height)
+
+#kill sprites below the world y bottom; groups keep spawn order, bottom to top,
+#so this stops at the first sprite still on screen
+def cull(group, bottom):
+	for sprite in group:
+		if sprite.y <= bottom:
+			break
+		sprite.kill()
+
+#make group hold exactly sprites, in order; group add/remove is slow, so when restoring the
+#same state repeatedly only the sprites spawned since are dropped
+def refill_group(group, sprites):
+	current = group.sprites()
+	if current[:len(sprites)] == sprites:
+		if len(current) > len(sprites):
+			group.remove(*current[len(sprites):])
+	else:
+		group.empty()
+		group.add(*sprites)
+
+#sprite without running __init__ (used by restore)
+def blank_sprite(sprite_class, width, height):
+	sprite = sprite_class.__new__(sprite_class)
+	pygame.sprite.Sprite.__init__(sprite)
+	sprite.x = sprite.y = 0.0
+	sprite.width = width
+	sprite.height = height
+	return sprite
+
+def set_floor(floor, values, i):
+	floor.x = values[i]
+	floor.y = values[i + 1]
+	floor.width = values[i + 2]
+	floor.is_moving = values[i + 3]
+	floor.movement_timer = values[i + 4]
+	floor.move_direction = values[i + 5]
+	floor.move_speed = values[i + 6]
+	return floor